@@ -14,7 +14,11 @@ Env vars (set in .env.gpustack, git-ignored):
     ATR_API_KEY          - static X-API-Key credential (empty for local development)
     ATR_HTTP_TIMEOUT     - gateway request timeout in seconds (default 300)
     OCR_ENGINE           - qwen3-vl | mistral (default qwen3-vl)
+    PDF_TEXT_ENGINE      - pypdf | pdfium (default pypdf)
+    PDF_TEXT_CACHE_DIR   - cache of extracted PDF text layers (default .cache/pdf_text;
+                           empty disables)
     EXTRACTION_SEED      - fixed chat-completion seed (default 42)
+    EXTRACTION_CONCURRENCY - extraction requests in flight per document (default 1)
 """
 from __future__ import annotations
 
@@ -65,6 +69,10 @@ EXTRACTION_MODEL   = _get("EXTRACTION_MODEL",   "qwen3-30b-a3b-instruct")
 ORCHESTRATOR_MODEL = _get("ORCHESTRATOR_MODEL", "minimax-m2.7")
 QWEN3_VL_MODEL     = _get("QWEN3_VL_MODEL",     "qwen3-vl-30b-a3b-instruct")
 EXTRACTION_SEED    = int(_get("EXTRACTION_SEED", "42"))
+# Chunks of one document may be sent concurrently so the server can batch
+# them; opt-in, since total load on the shared endpoint is this times
+# run_pipeline --workers
+EXTRACTION_CONCURRENCY = int(_get("EXTRACTION_CONCURRENCY", "1"))
 
 # OCR
 # "qwen3-vl" - GPUStack Qwen3 VL (default); falls back to Mistral if empty
@@ -72,6 +80,17 @@ EXTRACTION_SEED    = int(_get("EXTRACTION_SEED", "42"))
 #              and MISTRAL_API_KEY)
 OCR_ENGINE = _get("OCR_ENGINE", "qwen3-vl")
 
+# PDF text layer
+# "pypdf"  - pure-Python reader (default)
+# "pdfium" - PDFium C library via pypdfium2, several times faster; needs
+#            `pip install -e '.[fast-pdf]'`, falls back to pypdf without it.
+#            Its text differs in whitespace from pypdf's, so switching
+#            changes text_sha256 and hence every PDF's doc_id.
+PDF_TEXT_ENGINE = _get("PDF_TEXT_ENGINE", "pypdf")
+# Extracted text layers keyed by PDF content hash + backend version, so
+# re-runs over an unchanged corpus skip PDF parsing. OCR output is not cached.
+PDF_TEXT_CACHE_DIR = _get("PDF_TEXT_CACHE_DIR", str(_REPO_ROOT / ".cache" / "pdf_text"))
+
 # Linker thresholds (M10.3) - operating point documented in
 # evaluation/THRESHOLDS.md; sweep with `python -m evaluation.sweep`
 LINK_CANDIDATE_FLOOR = float(_get("LINK_CANDIDATE_FLOOR", "0.60"))
@@ -41,17 +41,27 @@ Returns
 
 from __future__ import annotations
 
+import contextlib
+import functools
 import hashlib
 import json
 import logging
+import os
 import re
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+try:
+    import fcntl
+except ImportError:  # non-POSIX: feedback saves are not serialised across processes
+    fcntl = None
+
 # GPUStack LLM client
-from llm_client import generate as _llm_generate
+from llm_client import generate_stream as _llm_generate_stream
+from llm_client import with_retry
 
 logger = logging.getLogger(__name__)
 
@@ -61,8 +71,13 @@ logger = logging.getLogger(__name__)
 
 # GPUStack model — see scripts/config.py / .env.gpustack
 _EXTRACTION_MODEL = "qwen3-30b-a3b-instruct"  # from config.EXTRACTION_MODEL at runtime
-_CHUNK_SIZE = 5_500   # chunk size for GPUStack extraction
+_CHUNK_SIZE = 5_500   # hard-split size for paragraphs over the packing budget
 _CHUNK_OVERLAP = 800
+# Packing budget per request, kept at the old _CHUNK_SIZE (~5,600 chars).
+# Bounded by the 4096-token response (every person costs ~80 output tokens),
+# not by the model's context window; raise it only against an eval run.
+_CHUNK_TOKENS = 1_400
+_CHARS_PER_TOKEN = 4  # byte-level estimate; avoids a tokenizer dependency
 
 _LANGUAGE_HINTS: dict[str, str] = {
     "la": """\
@@ -239,9 +254,18 @@ def _build_feedback_hint(terms: list[str]) -> str:
     )
 
 
-def _build_prompt(language_code: str | None = None, blocked_terms: list[str] | None = None) -> str:
+@functools.lru_cache(maxsize=32)
+def _build_prompt(language_code: str | None = None, blocked_terms: tuple[str, ...] = ()) -> str:
+    """
+    Instruction prefix shared by every chunk of a document.
+
+    Memoised so the prefix is formatted once rather than per chunk. The
+    chunk text is always appended after it, which keeps the prefix
+    byte-identical across requests — the condition for the inference
+    server's automatic prefix (KV) cache to skip re-encoding it.
+    """
     hint = _LANGUAGE_HINTS.get(language_code or "", "")
-    feedback_hint = _build_feedback_hint(blocked_terms or [])
+    feedback_hint = _build_feedback_hint(list(blocked_terms))
     return _JSON_PROMPT_BASE.format(
         language_hint=f"\n{hint}" if hint else "",
         feedback_hint=f"\n{feedback_hint}" if feedback_hint else "",
@@ -275,17 +299,12 @@ def _build_bibtex(metadata: dict[str, Any]) -> str:
     dtype = metadata.get("doc_type") or "other"
     btype = "book" if dtype in ("book",) else "article"
     key = _citekey(t, y)
-    lines = [f"@{btype}{{{key},"]
-    if a:
-        lines.append(f"  author = {{{a}}},")
-    lines.append(f"  title  = {{{t}}},")
-    if y:
-        lines.append(f"  year   = {{{y}}},")
     lang = metadata.get("language")
-    if lang:
-        lines.append(f"  note   = {{Language: {lang}}},")
-    lines.append("}")
-    return "\n".join(lines)
+    # One template per entry; optional fields collapse to "" when absent.
+    author_line = f"  author = {{{a}}},\n" if a else ""
+    year_line = f"  year   = {{{y}}},\n" if y else ""
+    lang_line = f"  note   = {{Language: {lang}}},\n" if lang else ""
+    return f"@{btype}{{{key},\n{author_line}  title  = {{{t}}},\n{year_line}{lang_line}}}"
 
 
 def _sanitise_text(text: str) -> str:
@@ -338,7 +357,32 @@ def _save_entity_feedback(path: str | None, data: dict[str, Any]) -> None:
         return
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_text(json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+    # Write-then-rename: pipeline workers read the store without the lock, so
+    # they must never see a half-written file.
+    tmp = p.with_name(f"{p.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, p)
+
+
+@contextlib.contextmanager
+def _feedback_store_lock(path: str):
+    """Serialise read-modify-write of the feedback store across processes.
+
+    ``run_pipeline --workers N`` extracts documents concurrently; without the
+    lock two workers would each save their own snapshot and drop the other's
+    auto-flags. Uses an advisory flock on a ``.lock`` sidecar file.
+    """
+    if fcntl is None:
+        yield
+        return
+    lock_path = Path(f"{path}.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
 
 
 def _feedback_terms_for_prompt(data: dict[str, Any], min_auto_count: int = 2) -> list[str]:
@@ -475,50 +519,17 @@ def _repair_json(raw: str) -> str:
 
 def _recover_truncated_json(raw: str) -> dict[str, Any]:
     """
-    Attempt to salvage persons from a truncated LLM JSON response.
+    Attempt to salvage persons and metadata from a truncated or malformed LLM JSON response.
     Finds the last complete person object (ending in '}') inside the persons array
     and reconstructs a valid minimal JSON document from it.
     """
-    # Try to extract whatever complete person objects we can
+    # Same scanner the streaming path uses, fed the whole text at once
     persons: list[dict[str, Any]] = []
     metadata: dict[str, Any] = {}
-
-    # Find the persons array start
-    persons_start = raw.find('"persons"')
-    if persons_start == -1:
-        return {"persons": persons, "metadata": metadata}
-
-    bracket_start = raw.find("[", persons_start)
-    if bracket_start == -1:
-        return {"persons": persons, "metadata": metadata}
-
-    # Walk through looking for complete {...} objects
-    # Use a simple bracket counter to find each complete object
-    i = bracket_start + 1
-    depth = 0
-    obj_start = -1
-
-    while i < len(raw):
-        c = raw[i]
-        if c == "{":
-            if depth == 0:
-                obj_start = i
-            depth += 1
-        elif c == "}":
-            depth -= 1
-            if depth == 0 and obj_start != -1:
-                obj_str = raw[obj_start:i + 1]
-                try:
-                    obj = json.loads(obj_str)
-                    coerced = _coerce_person(obj)
-                    if coerced:
-                        persons.append(coerced)
-                except (json.JSONDecodeError, Exception):
-                    pass
-                obj_start = -1
-        elif c == "]" and depth == 0:
-            break  # end of persons array (possibly truncated)
-        i += 1
+    for obj in _StreamingPersonsParser().feed(raw):
+        coerced = _coerce_person(obj)
+        if coerced:
+            persons.append(coerced)
 
     # Try to extract metadata if it appears after "metadata"
     meta_start = raw.find('"metadata"')
@@ -541,6 +552,80 @@ def _recover_truncated_json(raw: str) -> dict[str, Any]:
     return {"persons": persons, "metadata": metadata}
 
 
+class _StreamingPersonsParser:
+    """
+    Incrementally pull complete person objects out of a streamed response.
+
+    ``feed`` takes the model's content deltas as they arrive and returns the
+    person objects that closed within that delta, so a response cut off
+    mid-array has already yielded every finished person by the time the
+    stream ends — no second recovery pass over the text is needed. String
+    literals are tracked, so braces inside a context snippet do not split
+    an object.
+    """
+
+    def __init__(self) -> None:
+        self._parts: list[str] = []
+        self._head = ""  # text seen before the persons array opens
+        self._in_array = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._obj: list[str] = []
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far, for the whole-document parse."""
+        return "".join(self._parts)
+
+    def feed(self, delta: str) -> list[dict[str, Any]]:
+        self._parts.append(delta)
+        if self._done:
+            return []
+        if not self._in_array:
+            self._head += delta
+            key = self._head.find('"persons"')
+            bracket = self._head.find("[", key) if key != -1 else -1
+            if bracket == -1:
+                return []
+            self._in_array = True
+            delta = self._head[bracket + 1:]
+            self._head = ""
+
+        found: list[dict[str, Any]] = []
+        for c in delta:
+            if self._depth:
+                self._obj.append(c)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+            elif c == '"':
+                self._in_string = True
+            elif c == "{":
+                if self._depth == 0:
+                    self._obj = [c]
+                self._depth += 1
+            elif c == "}" and self._depth:
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        obj = json.loads("".join(self._obj))
+                    except json.JSONDecodeError:
+                        obj = None
+                    if isinstance(obj, dict):
+                        found.append(obj)
+                    self._obj = []
+            elif c == "]" and self._depth == 0:
+                self._done = True  # end of persons array
+                break
+        return found
+
+
 def _chunk_text(text: str, size: int = _CHUNK_SIZE, overlap: int = _CHUNK_OVERLAP) -> list[tuple[int, str]]:
     """
     Split text into overlapping chunks at paragraph boundaries.
@@ -612,6 +697,47 @@ def _chunk_text(text: str, size: int = _CHUNK_SIZE, overlap: int = _CHUNK_OVERLA
     return chunks
 
 
+def _pack_chunks(text: str, max_tokens: int = _CHUNK_TOKENS) -> list[tuple[int, str]]:
+    """
+    Bin-pack contiguous paragraphs into as few chunks as the token budget allows.
+
+    Paragraphs (split on blank lines) accumulate until the next one would push
+    the estimate (``len // _CHARS_PER_TOKEN``) past *max_tokens*. Offsets are
+    each chunk's true position in *text*, so ``source_offset`` adjustment stays
+    correct. A single paragraph over budget is hard-split by ``_chunk_text``.
+    """
+    limit = max_tokens * _CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return [(0, text)]
+
+    bounds: list[tuple[int, int]] = []
+    pos = 0
+    for sep in re.finditer(r"\n\n+", text):
+        bounds.append((pos, sep.start()))
+        pos = sep.end()
+    bounds.append((pos, len(text)))
+
+    chunks: list[tuple[int, str]] = []
+    start: int | None = None
+    end = 0
+    for p_start, p_end in bounds:
+        if start is not None and p_end - start > limit:
+            chunks.append((start, text[start:end]))
+            start = None
+        if p_end - p_start > limit:
+            chunks.extend(
+                (p_start + off, piece) for off, piece in _chunk_text(text[p_start:p_end])
+            )
+            continue
+        if start is None:
+            start = p_start
+        end = p_end
+    if start is not None:
+        chunks.append((start, text[start:end]))
+
+    return chunks
+
+
 # Bibliographic noise patterns — catch false positives that slip through
 _BIB_NOISE_PATTERNS = re.compile(
     r"\b(vol(ume)?|no\.?|number|pp\.?|pages?|published|publication|copyright|"
@@ -1201,14 +1327,40 @@ def _extract_gpustack_chunk(
 ) -> dict[str, Any]:
     """Call GPUStack on a single chunk. Returns parsed JSON or raises."""
     clean_chunk = _sanitise_text(_nfc(chunk))
-    prompt = _build_prompt(language, blocked_terms=blocked_terms) + clean_chunk
-    raw_text = _llm_generate(
-        prompt,
-        model=_EXTRACTION_MODEL,
-        max_tokens=4096,
-        temperature=0.1,
-    )
-    raw_text = _repair_json(raw_text)
+    prompt = _build_prompt(language, tuple(blocked_terms or ())) + clean_chunk
+    partial: list[dict[str, Any]] = []
+
+    @with_retry(max_attempts=3, base_delay=2.0)
+    def stream_once() -> str:
+        # A retry replays the response from the start: fresh parser each time.
+        parser = _StreamingPersonsParser()
+        streamed: list[dict[str, Any]] = []
+        try:
+            for delta in _llm_generate_stream(
+                prompt,
+                model=_EXTRACTION_MODEL,
+                max_tokens=4096,
+                temperature=0.1,
+            ):
+                streamed.extend(parser.feed(delta))
+        except Exception:
+            if len(streamed) > len(partial):
+                partial[:] = streamed
+            raise
+        return parser.text
+
+    try:
+        raw_text = _repair_json(stream_once())
+    except Exception as exc:
+        if not partial:
+            raise
+        # Every attempt broke off mid-response; keep what the longest one
+        # delivered rather than discarding it, but mark the chunk degraded.
+        logger.warning(
+            "GPUStack stream failed mid-response (%s); keeping %d person(s) parsed before the break.",
+            exc, len(partial),
+        )
+        return {"persons": partial, "metadata": {}, "degraded": type(exc).__name__}
 
     # First try clean parse
     try:
@@ -1216,7 +1368,7 @@ def _extract_gpustack_chunk(
     except json.JSONDecodeError:
         pass
 
-    # Response was likely truncated — salvage whatever complete objects exist
+    # Response was truncated or malformed — salvage whatever complete objects exist
     logger.debug("Attempting truncation recovery for chunk.")
     recovered = _recover_truncated_json(raw_text)
     if recovered.get("persons"):
@@ -1233,8 +1385,13 @@ def _extract_gpustack(
     language: str | None = None,
     blocked_terms: list[str] | None = None,
 ) -> dict[str, Any]:
-    """Full GPUStack extraction with chunking."""
-    from config import GPUSTACK_BASE_URL
+    """Full GPUStack extraction with chunking.
+
+    Up to EXTRACTION_CONCURRENCY chunk requests are in flight at once;
+    results are merged in chunk order, so the output does not depend on
+    which request finishes first.
+    """
+    from config import EXTRACTION_CONCURRENCY, GPUSTACK_BASE_URL
 
     if not GPUSTACK_BASE_URL:
         logger.warning("GPUSTACK_BASE_URL not set; using fallback extraction.")
@@ -1242,19 +1399,26 @@ def _extract_gpustack(
         result["degradation"] = {"chunks": 1, "fallback_chunks": 1, "reasons": ["not_configured"]}
         return result
 
-    chunks = _chunk_text(text)
+    chunks = _pack_chunks(text)
     all_persons: list[dict[str, Any]] = []
     merged_metadata: dict[str, Any] = {}
     fallback_chunks = 0
+    partial_chunks = 0
     failure_reasons: list[str] = []
 
-    for offset, chunk in chunks:
-        try:
-            result = _extract_gpustack_chunk(
+    with ThreadPoolExecutor(max_workers=max(1, min(EXTRACTION_CONCURRENCY, len(chunks)))) as pool:
+        futures = [
+            pool.submit(
+                _extract_gpustack_chunk,
                 chunk,
                 language=language,
                 blocked_terms=blocked_terms,
             )
+            for _, chunk in chunks
+        ]
+    for (offset, chunk), future in zip(chunks, futures):
+        try:
+            result = future.result()
         except Exception as exc:
             logger.warning("GPUStack chunk failed (offset=%d): %s", offset, exc)
             fallback_chunks += 1
@@ -1262,6 +1426,13 @@ def _extract_gpustack(
             if reason not in failure_reasons:
                 failure_reasons.append(reason)
             result = _extract_fallback(chunk)
+        else:
+            if result.get("degraded"):
+                # Model output cut off mid-stream: the chunk is incomplete
+                partial_chunks += 1
+                reason = result["degraded"]
+                if reason not in failure_reasons:
+                    failure_reasons.append(reason)
 
         for p in result.get("persons") or []:
             coerced = _coerce_person(p)
@@ -1292,6 +1463,11 @@ def _extract_gpustack(
             "Extraction degraded: %d/%d chunk(s) fell back to heuristic NER (%s)",
             fallback_chunks, len(chunks), ", ".join(failure_reasons) or "unknown",
         )
+    if partial_chunks:
+        logger.error(
+            "Extraction degraded: %d/%d chunk(s) kept only a partial model response (%s)",
+            partial_chunks, len(chunks), ", ".join(failure_reasons) or "unknown",
+        )
 
     return {
         "persons": persons,
@@ -1300,6 +1476,7 @@ def _extract_gpustack(
         "degradation": {
             "chunks": len(chunks),
             "fallback_chunks": fallback_chunks,
+            "partial_chunks": partial_chunks,
             "reasons": failure_reasons,
         },
     }
@@ -1355,12 +1532,15 @@ def extract_persons_and_metadata(
         deg = result.get("degradation") or {}
         n_chunks = deg.get("chunks", 0) or 0
         n_fallback = deg.get("fallback_chunks", 0) or 0
-        if n_fallback == 0:
-            provider = "gpustack"
-        elif n_fallback >= n_chunks:
+        n_partial = deg.get("partial_chunks", 0) or 0
+        if n_fallback >= n_chunks > 0:
             provider = "heuristic"  # nothing came from the model
-        else:
+        elif n_fallback:
             provider = "mixed"
+        elif n_partial:
+            provider = "gpustack_partial"  # model only, but some responses cut off
+        else:
+            provider = "gpustack"
         result["engine"] = {
             "provider": provider,
             "model": EXTRACTION_MODEL if provider != "heuristic" else None,
@@ -1368,6 +1548,7 @@ def extract_persons_and_metadata(
             "configured_provider": "gpustack",
             "chunks": n_chunks,
             "fallback_chunks": n_fallback,
+            "partial_chunks": n_partial,
             "degraded_reasons": deg.get("reasons") or [],
         }
     else:
@@ -1384,9 +1565,13 @@ def extract_persons_and_metadata(
     result["persons"] = _dedup_persons(filtered_persons)
 
     if feedback_path:
-        if flagged:
-            _record_problem_entities(feedback_store, flagged)
-        _save_entity_feedback(feedback_path, feedback_store)
+        with _feedback_store_lock(feedback_path):
+            # Re-read under the lock: a concurrent worker may have saved
+            # other documents' flags since this document's store was loaded.
+            feedback_store = _load_entity_feedback(feedback_path)
+            if flagged:
+                _record_problem_entities(feedback_store, flagged)
+            _save_entity_feedback(feedback_path, feedback_store)
 
     kept = result["persons"]
     extracted_total = len(kept) + len(flagged)
@@ -18,6 +18,11 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # optional speed-up: pip install -e '.[fast-json]'
+    orjson = None
+
 # ── Constants ──────────────────────────────────────────────────────────────
 KG_INPUT = Path("data/unified_kg.json")
 KG_OUTPUT = Path("data/unified_kg.ttl")
@@ -39,16 +44,23 @@ PREFIXES = """
 """
 
 # ── Helper Functions ───────────────────────────────────────────────────────
+_TURTLE_ESCAPES = str.maketrans({
+    '\\': '\\\\',
+    '"': '\\"',
+    '\n': '\\n',
+    '\r': '\\r',
+    '\t': '\\t',
+})
+
+
 def escape_turtle(s: str) -> str:
     """Escape special characters for Turtle string literals."""
     if not s:
         return '""'
-    s = s.replace('\\', '\\\\')
-    s = s.replace('"', '\\"')
-    s = s.replace('\n', '\\n')
-    s = s.replace('\r', '\\r')
-    s = s.replace('\t', '\\t')
-    return f'"{s}"'
+    return f'"{s.translate(_TURTLE_ESCAPES)}"'
+
+
+_YEAR_RE = re.compile(r'\b(\d{4})\b')
 
 
 def format_date(date_str: str | None) -> str | None:
@@ -59,12 +71,15 @@ def format_date(date_str: str | None) -> str | None:
     # "1093" → "1093"^^xsd:gYear
     # "1093-06-21" → "1093"^^xsd:gYear
     # "fl. 1145-1152" → extract first year
-    match = re.search(r'\b(\d{4})\b', str(date_str))
+    match = _YEAR_RE.search(str(date_str))
     if match:
         return f'"{match.group(1)}"^^xsd:gYear'
     return None
 
 
+_URI_LOCAL_SEPARATORS = str.maketrans(":- ", "___")
+
+
 def entity_to_uri(entity_id: str) -> str:
     """Convert internal entity ID to URI."""
     # AUTH:CR1 → outremer:AUTH_CR1
@@ -74,7 +89,7 @@ def entity_to_uri(entity_id: str) -> str:
         qid = entity_id.replace("WIKIDATA:", "")
         return f"wd:{qid}"
     else:
-        local = entity_id.replace(":", "_").replace("-", "_").replace(" ", "_")
+        local = entity_id.translate(_URI_LOCAL_SEPARATORS)
         return f"outremer:{local}"
 
 
@@ -86,31 +101,31 @@ def normalize_to_uri(s: str) -> str:
 
 
 # ── Triple Generation ──────────────────────────────────────────────────────
-def generate_person_triples(entity: dict[str, Any]) -> list[str]:
-    """Generate RDF triples for a person entity."""
-    triples = []
+def generate_person_triples(entity: dict[str, Any]) -> str:
+    """Generate the Turtle block (one subject, its predicate list) for a person entity."""
+    statements = []
 
     entity_id = entity.get('id', '')
     uri = entity_to_uri(entity_id)
 
     # Type declaration
-    triples.append(f"{uri} a sdhss:Person ;")
+    statements.append(f"{uri} a sdhss:Person")
 
     # Preferred label
     preferred = entity.get('preferred_label', '')
     if preferred:
-        triples.append(f"    sdhss:preferredLabel {escape_turtle(preferred)} ;")
+        statements.append(f"    sdhss:preferredLabel {escape_turtle(preferred)}")
 
     # Variant names
     names = entity.get('names', {})
     variants = names.get('variants', [])
     for variant in variants[:10]:  # Limit to 10 variants
-        triples.append(f"    sdhss:variantName {escape_turtle(variant)} ;")
+        statements.append(f"    sdhss:variantName {escape_turtle(variant)}")
 
     # Normalized forms
     normalized = names.get('normalized', [])
     for norm in normalized[:5]:  # Limit to 5 normalized forms
-        triples.append(f"    sdhss:normalizedForm {escape_turtle(norm)} ;")
+        statements.append(f"    sdhss:normalizedForm {escape_turtle(norm)}")
 
     # Biographical data
     bio = entity.get('bio', {})
@@ -120,21 +135,21 @@ def generate_person_triples(entity: dict[str, Any]) -> list[str]:
             birth = birth.get('date')
         birth_formatted = format_date(birth)
         if birth_formatted:
-            triples.append(f"    sdhss:birthDate {birth_formatted} ;")
+            statements.append(f"    sdhss:birthDate {birth_formatted}")
 
         death = bio.get('death')
         if isinstance(death, dict):
             death = death.get('date')
         death_formatted = format_date(death)
         if death_formatted:
-            triples.append(f"    sdhss:deathDate {death_formatted} ;")
+            statements.append(f"    sdhss:deathDate {death_formatted}")
 
         floruit = bio.get('floruit')
         if isinstance(floruit, dict):
             floruit = floruit.get('date')
         floruit_formatted = format_date(floruit)
         if floruit_formatted:
-            triples.append(f"    sdhss:floruit {floruit_formatted} ;")
+            statements.append(f"    sdhss:floruit {floruit_formatted}")
 
         gender = bio.get('gender', 'unknown')
         if gender:
@@ -143,30 +158,30 @@ def generate_person_triples(entity: dict[str, Any]) -> list[str]:
                 gender_uri = "sdhss:Male"
             elif gender.lower() in ('f', 'female'):
                 gender_uri = "sdhss:Female"
-            triples.append(f"    sdhss:gender {gender_uri} ;")
+            statements.append(f"    sdhss:gender {gender_uri}")
 
     # Identifiers (external links)
     identifiers = entity.get('identifiers', {})
     if 'wikidata_qid' in identifiers:
         qid = identifiers['wikidata_qid']
-        triples.append(f"    sdhss:wikidataQid wd:{qid} ;")
-        triples.append(f"    foaf:isPrimaryTopicOf <https://www.wikidata.org/wiki/{qid}> ;")
+        statements.append(f"    sdhss:wikidataQid wd:{qid}")
+        statements.append(f"    foaf:isPrimaryTopicOf <https://www.wikidata.org/wiki/{qid}>")
 
     if 'outremer_auth' in identifiers:
         auth_id = identifiers['outremer_auth']
-        triples.append(f"    sdhss:outremerAuthorityId {escape_turtle(auth_id)} ;")
+        statements.append(f"    sdhss:outremerAuthorityId {escape_turtle(auth_id)}")
 
     if 'dhi_id' in identifiers:
         dhi_id = identifiers['dhi_id']
-        triples.append(f"    sdhss:dhiId {escape_turtle(dhi_id)} ;")
-        triples.append(f"    foaf:isPrimaryTopicOf <https://www.dhi.ac.uk/crusaders/person/?id={dhi_id}> ;")
+        statements.append(f"    sdhss:dhiId {escape_turtle(dhi_id)}")
+        statements.append(f"    foaf:isPrimaryTopicOf <https://www.dhi.ac.uk/crusaders/person/?id={dhi_id}>")
 
     # Roles
     roles = entity.get('roles', [])
     for role in roles[:5]:  # Limit to 5 roles
         role_label = role.get('label', role.get('type', ''))
         if role_label:
-            triples.append(f"    sdhss:hasRole {escape_turtle(role_label)} ;")
+            statements.append(f"    sdhss:hasRole {escape_turtle(role_label)}")
 
     # Places
     places = entity.get('places', [])
@@ -174,7 +189,7 @@ def generate_person_triples(entity: dict[str, Any]) -> list[str]:
         place_label = place.get('label', '')
         place_type = place.get('type', 'associated_with')
         if place_label:
-            triples.append(f"    sdhss:{place_type}Place {escape_turtle(place_label)} ;")
+            statements.append(f"    sdhss:{place_type}Place {escape_turtle(place_label)}")
 
     # Provenance
     provenance = entity.get('provenance', {})
@@ -185,25 +200,25 @@ def generate_person_triples(entity: dict[str, Any]) -> list[str]:
         source_file = source.get('source_file', source.get('source_url', ''))
 
         if source_file:
-            triples.append(f"    sdhss:sourceDocument {escape_turtle(source_file)} ;")
-        triples.append(f"    sdhss:extractionMethod {escape_turtle(source_type)} ;")
-        triples.append(f"    sdhss:confidence \"{confidence}\"^^xsd:decimal ;")
+            statements.append(f"    sdhss:sourceDocument {escape_turtle(source_file)}")
+        statements.append(f"    sdhss:extractionMethod {escape_turtle(source_type)}")
+        statements.append(f"    sdhss:confidence \"{confidence}\"^^xsd:decimal")
 
     # Flags
     flags = entity.get('flags', {})
     for flag_key, flag_value in flags.items():
         if isinstance(flag_value, bool) and flag_value:
-            triples.append(f"    sdhss:flag_{normalize_to_uri(flag_key)} true ;")
+            statements.append(f"    sdhss:flag_{normalize_to_uri(flag_key)} true")
 
-    # Remove trailing semicolon and add period
-    if triples and triples[-1].endswith(' ;'):
-        triples[-1] = triples[-1][:-2] + ' .'
-    elif triples and triples[-1].endswith(' .'):
-        pass  # Already has period
-    else:
-        triples.append(' .')
+    # Predicate-object pairs are separated by ' ;' and the block closes with ' .'
+    return " ;\n".join(statements) + " ."
 
-    return triples
+
+def write_person_triples(entity: dict[str, Any], out) -> None:
+    """Write one person's Turtle block to *out*, preceded by a blank-line separator."""
+    out.write("\n")
+    out.write(generate_person_triples(entity))
+    out.write("\n")
 
 
 def generate_header() -> list[str]:
@@ -237,8 +252,11 @@ def main():
         print("   Run: .venv/bin/python3 scripts/build_unified_kg.py first")
         return 1
 
-    with open(KG_INPUT, encoding='utf-8') as f:
-        kg_data = json.load(f)
+    if orjson is not None:
+        kg_data = orjson.loads(KG_INPUT.read_bytes())
+    else:
+        with open(KG_INPUT, encoding='utf-8') as f:
+            kg_data = json.load(f)
 
     print(f"   Loaded {len(kg_data)} entities")
 
@@ -250,27 +268,21 @@ def main():
 
     print(f"   Entity types: {type_counts}")
 
-    # Generate triples
-    print("\n📝 Generating RDF triples...")
-    all_triples = generate_header()
-
-    person_count = 0
-    for entity_id, entity in kg_data.items():
-        entity_type = entity.get('type', 'person')
-
-        # Currently only handle persons (expand for events, groups, places)
-        if entity_type == 'person':
-            triples = generate_person_triples(entity)
-            all_triples.extend(triples)
-            all_triples.append("")  # Blank line between entities
-            person_count += 1
-
-    # Write output
-    print(f"\n💾 Writing {KG_OUTPUT}...")
+    # Stream triples entity by entity — the full TTL is never held in memory
+    print(f"\n📝 Writing RDF triples to {KG_OUTPUT}...")
     KG_OUTPUT.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(KG_OUTPUT, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(all_triples))
+    person_count = 0
+    # 1 MiB buffer: the TTL is written in many small per-entity pieces
+    with open(KG_OUTPUT, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write('\n'.join(generate_header()))
+        for entity_id, entity in kg_data.items():
+            entity_type = entity.get('type', 'person')
+
+            # Currently only handle persons (expand for events, groups, places)
+            if entity_type == 'person':
+                write_person_triples(entity, f)
+                person_count += 1
 
     file_size = KG_OUTPUT.stat().st_size / (1024 * 1024)  # MB
     print(f"   Written {file_size:.2f} MB")
@@ -24,24 +24,36 @@ LINK_HIGH env vars, defaults 0.60 / 0.75 / 0.90.
 
 from __future__ import annotations
 
+import functools
 import re
 import unicodedata
+from dataclasses import dataclass, field
 from typing import Any
 
 from config import LINK_CANDIDATE_FLOOR, LINK_HIGH, LINK_MEDIUM
 
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # token-overlap fallback in _ensemble_score
+    fuzz = process = None
+
 # Connective particles folded away for comparison. Deliberately short and
 # Romance/Germanic only: Arabic structural elements (ibn, al-…) are
 # name-bearing and must not be folded.
 _PARTICLES = {"de", "of", "von", "du", "der", "des", "le", "la", "d"}
 
+_NON_WORD_RE = re.compile(r"[^\w\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
 
+@functools.lru_cache(maxsize=200_000)
 def normalise(s: str) -> str:
     """Lowercase, strip accents, collapse whitespace, strip punctuation."""
-    s = unicodedata.normalize("NFKD", s)
-    s = "".join(c for c in s if not unicodedata.combining(c))
-    s = re.sub(r"[^\w\s]", " ", s)
-    return re.sub(r"\s+", " ", s).lower().strip()
+    if not s.isascii():  # ASCII has no decompositions or combining marks
+        s = unicodedata.normalize("NFKD", s)
+        s = "".join(c for c in s if not unicodedata.combining(c))
+    s = _NON_WORD_RE.sub(" ", s)
+    return _WHITESPACE_RE.sub(" ", s).lower().strip()
 
 
 def fold_particles(norm: str) -> str:
@@ -58,9 +70,17 @@ def fold_particles(norm: str) -> str:
 
 def _fuzzy_score(a: str, b: str) -> float:
     """Ensemble fuzzy ratio on normalised names, 0.0–1.0 (M10.2)."""
-    try:
-        from rapidfuzz import fuzz
-    except ImportError:
+    fa, fb = fold_particles(a), fold_particles(b)
+    return _ensemble_score(a, fa, len(fa.split()), b, fb, len(fb.split()))
+
+
+def _ensemble_score(a: str, fa: str, na: int, b: str, fb: str, nb: int) -> float:
+    """``_fuzzy_score`` with the folded forms and their token counts supplied.
+
+    The linker folds each authority variant once per call rather than once
+    per (person, variant) pair.
+    """
+    if fuzz is None:
         # Fallback: simple token overlap
         set_a, set_b = set(a.split()), set(b.split())
         if not set_a or not set_b:
@@ -69,7 +89,6 @@ def _fuzzy_score(a: str, b: str) -> float:
 
     score = fuzz.token_sort_ratio(a, b) / 100.0
 
-    fa, fb = fold_particles(a), fold_particles(b)
     if (fa, fb) != (a, b):
         score = max(score, fuzz.token_sort_ratio(fa, fb) / 100.0)
 
@@ -79,7 +98,7 @@ def _fuzzy_score(a: str, b: str) -> float:
     # Caen" vs "Ralph II of Fougères" → 0.79, overtaking the correct
     # candidate). Hence: folded forms only, ≥2 substantive tokens per
     # side, and damped below sort-order agreement.
-    if len(fa.split()) >= 2 and len(fb.split()) >= 2:
+    if na >= 2 and nb >= 2:
         score = max(score, 0.90 * fuzz.token_set_ratio(fa, fb) / 100.0)
 
     return score
@@ -149,6 +168,159 @@ def build_authority_lookup(outremer: dict[str, Any]) -> list[dict[str, Any]]:
     return lookup
 
 
+# (normalised variant, its tokens, particle-folded form, folded token count)
+_Variant = tuple[str, list[str], str, int]
+
+
+def _score_entry(
+    pnorm: str, p_tokens: list[str], p_fold: str, p_nfold: int, variants: list[_Variant]
+) -> tuple[float, str]:
+    """Best (score, match_type) of one authority entry over ``variants``, in order."""
+    best_score = 0.0
+    best_match_type = "fuzzy"
+
+    for variant_norm, v_tokens, v_fold, v_nfold in variants:
+        # Exact match
+        if pnorm == variant_norm:
+            best_score = 1.0
+            best_match_type = "exact"
+            break
+        # Token containment (reduces false positives from naive substrings)
+        elif len(p_tokens) >= 2 and all(t in v_tokens for t in p_tokens):
+            sub_score = len(p_tokens) / max(len(v_tokens), 1)
+            if sub_score > best_score:
+                best_score = sub_score
+                best_match_type = "token_subset"
+        elif len(v_tokens) >= 2 and all(t in p_tokens for t in v_tokens):
+            sub_score = len(v_tokens) / max(len(p_tokens), 1)
+            if sub_score > best_score:
+                best_score = sub_score
+                best_match_type = "token_subset"
+        # Fuzzy ensemble
+        else:
+            fs = _ensemble_score(pnorm, p_fold, p_nfold, variant_norm, v_fold, v_nfold)
+            if fs > best_score:
+                best_score = fs
+                best_match_type = "fuzzy"
+
+    return best_score, best_match_type
+
+
+@dataclass(slots=True)
+class _VariantIndex:
+    """Flat view of every authority variant, for blocked candidate generation.
+
+    ``owner[i]`` is the (entry index, variant position) of flat variant *i*.
+    ``postings`` maps a token to the variants containing it; ``first_token``
+    maps a token to the multi-token variants that start with it.
+    """
+
+    norms: list[str] = field(default_factory=list)
+    folds: list[str] = field(default_factory=list)
+    owner: list[tuple[int, int]] = field(default_factory=list)
+    multi_folds: list[str] = field(default_factory=list)
+    multi_flat: list[int] = field(default_factory=list)
+    postings: dict[str, set[int]] = field(default_factory=dict)
+    first_token: dict[str, list[int]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, variant_table: list[tuple[dict[str, Any], list[_Variant]]]) -> _VariantIndex:
+        index = cls()
+        for e_idx, (_entry, variants) in enumerate(variant_table):
+            for v_pos, (v_norm, v_tokens, v_fold, v_nfold) in enumerate(variants):
+                i = len(index.norms)
+                index.norms.append(v_norm)
+                index.folds.append(v_fold)
+                index.owner.append((e_idx, v_pos))
+                if v_nfold >= 2:
+                    index.multi_folds.append(v_fold)
+                    index.multi_flat.append(i)
+                for t in v_tokens:
+                    index.postings.setdefault(t, set()).add(i)
+                if len(v_tokens) >= 2:
+                    index.first_token.setdefault(v_tokens[0], []).append(i)
+        return index
+
+    def shortlist(
+        self, pnorm: str, p_tokens: list[str], p_fold: str, p_nfold: int, floor: float
+    ) -> set[int]:
+        """Flat indices of every variant that can score ``floor`` or better.
+
+        The three fuzzy components are pruned in C with rapidfuzz score
+        cutoffs; token_subset candidates come from the token index. A
+        variant outside the shortlist scores below ``floor`` on every
+        branch, so it can neither be kept nor change a kept entry's best.
+        """
+        # A full point below the floor: rapidfuzz turns cutoffs into edit
+        # distance bounds with its own rounding, and a ratio sitting exactly
+        # on the floor (0.90 * 83.33 = 0.75) must not be pruned.
+        cutoff = max(floor * 100.0 - 1.0, 0.0)
+        hits: set[int] = set()
+        for _, _, i in process.extract(
+            pnorm, self.norms, scorer=fuzz.token_sort_ratio, score_cutoff=cutoff, limit=None
+        ):
+            hits.add(i)
+        for _, _, i in process.extract(
+            p_fold, self.folds, scorer=fuzz.token_sort_ratio, score_cutoff=cutoff, limit=None
+        ):
+            hits.add(i)
+        if p_nfold >= 2:
+            for _, _, j in process.extract(
+                p_fold, self.multi_folds, scorer=fuzz.token_set_ratio,
+                score_cutoff=min(cutoff / 0.90, 100.0), limit=None,
+            ):
+                hits.add(self.multi_flat[j])
+
+        p_set = set(p_tokens)
+        # person ⊆ variant: the variant carries every person token
+        if len(p_tokens) >= 2:
+            hits |= set.intersection(*(self.postings.get(t, set()) for t in p_set))
+        # variant ⊆ person: in particular the variant's first token is a person token
+        for t in p_set:
+            hits.update(self.first_token.get(t, ()))
+        return hits
+
+
+def _rank_entries(
+    pnorm: str,
+    variant_table: list[tuple[dict[str, Any], list[_Variant]]],
+    index: _VariantIndex | None,
+    min_score: float,
+    top_k: int,
+) -> list[tuple[float, str, dict[str, Any]]]:
+    """Top-k ``(score, match_type, entry)`` at or above ``min_score`` for one name."""
+    p_tokens = pnorm.split()
+    p_fold = fold_particles(pnorm)
+    p_nfold = len(p_fold.split())
+
+    if index is None:
+        to_score = variant_table
+    else:
+        # Regroup shortlisted variants under their entries, keeping both
+        # entry order (sort stability) and variant order (tie-breaking).
+        grouped: dict[int, list[int]] = {}
+        for e_idx, v_pos in sorted(
+            index.owner[i]
+            for i in index.shortlist(pnorm, p_tokens, p_fold, p_nfold, min_score)
+        ):
+            grouped.setdefault(e_idx, []).append(v_pos)
+        to_score = [
+            (variant_table[e_idx][0], [variant_table[e_idx][1][v] for v in v_positions])
+            for e_idx, v_positions in grouped.items()
+        ]
+
+    # Score every (shortlisted) authority entry
+    scored: list[tuple[float, str, dict[str, Any]]] = []  # (score, match_type, entry)
+    for entry, variants in to_score:
+        best_score, best_match_type = _score_entry(pnorm, p_tokens, p_fold, p_nfold, variants)
+        if best_score >= min_score:
+            scored.append((best_score, best_match_type, entry))
+
+    # Sort descending by score, take top_k
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return scored[:top_k]
+
+
 def link_voyagers_to_outremer(
     persons: list[dict[str, Any]],
     authority_lookup: list[dict[str, Any]],
@@ -159,55 +331,48 @@ def link_voyagers_to_outremer(
     Link extracted person mentions to Outremer authority entries using fuzzy matching.
 
     Returns one link object per person mention, each containing ranked candidates.
+    With rapidfuzz available and a positive ``min_score``, only a blocked
+    shortlist of variants is scored per person; results equal the full scan.
     """
     if min_score is None:
         min_score = LINK_CANDIDATE_FLOOR
     links: list[dict[str, Any]] = []
 
+    # Per-variant work that does not depend on the person: token list,
+    # particle-folded form and its token count, computed once per call.
+    variant_table: list[tuple[dict[str, Any], list[_Variant]]] = [
+        (
+            entry,
+            [
+                (v, v.split(), fv, len(fv.split()))
+                for v in entry["all_norms"]
+                for fv in (fold_particles(v),)
+            ],
+        )
+        for entry in authority_lookup
+    ]
+    # With a non-positive floor every entry is a candidate: nothing to block.
+    index = _VariantIndex.build(variant_table) if process is not None and min_score > 0 else None
+
+    # Documents repeat the same names many times; rank each distinct
+    # normalised form once and rebuild the per-mention links from that.
+    ranked: dict[str, list[tuple[float, str, dict[str, Any]]]] = {}
+
+    # A repeated mention ranks identically, so its link is the same as the
+    # first one's: keep the first and skip the rest before building anything.
+    seen: set[str] = set()
+
     for p in persons:
         pname = (p.get("name") or "").strip()
-        if not pname:
+        if not pname or pname in seen:
             continue
+        seen.add(pname)
         pnorm = normalise(pname)
-        p_tokens = pnorm.split()
-
-        # Score every authority entry
-        scored: list[tuple[float, str, dict[str, Any]]] = []  # (score, match_type, entry)
-        for entry in authority_lookup:
-            best_score = 0.0
-            best_match_type = "fuzzy"
-
-            for variant_norm in entry["all_norms"]:
-                v_tokens = variant_norm.split()
-                # Exact match
-                if pnorm == variant_norm:
-                    best_score = 1.0
-                    best_match_type = "exact"
-                    break
-                # Token containment (reduces false positives from naive substrings)
-                elif len(p_tokens) >= 2 and all(t in v_tokens for t in p_tokens):
-                    sub_score = len(p_tokens) / max(len(v_tokens), 1)
-                    if sub_score > best_score:
-                        best_score = sub_score
-                        best_match_type = "token_subset"
-                elif len(v_tokens) >= 2 and all(t in p_tokens for t in v_tokens):
-                    sub_score = len(v_tokens) / max(len(p_tokens), 1)
-                    if sub_score > best_score:
-                        best_score = sub_score
-                        best_match_type = "token_subset"
-                # Fuzzy ensemble
-                else:
-                    fs = _fuzzy_score(pnorm, variant_norm)
-                    if fs > best_score:
-                        best_score = fs
-                        best_match_type = "fuzzy"
-
-            if best_score >= min_score:
-                scored.append((best_score, best_match_type, entry))
-
-        # Sort descending by score, take top_k
-        scored.sort(key=lambda x: x[0], reverse=True)
-        top_candidates = scored[:top_k]
+        top_candidates = ranked.get(pnorm)
+        if top_candidates is None:
+            top_candidates = ranked[pnorm] = _rank_entries(
+                pnorm, variant_table, index, min_score, top_k
+            )
 
         candidates = [
             {
@@ -234,18 +399,4 @@ def link_voyagers_to_outremer(
             "status": status,
         })
 
-    # De-duplicate: if same (person, outremer_id) appears multiple times, keep highest score
-    seen: dict[tuple[str, str], int] = {}  # key → index in links
-    deduped: list[dict[str, Any]] = []
-    for link in links:
-        top = link.get("top_candidate")
-        key = (link["person"], top["outremer_id"] if top else "__none__")
-        if key in seen:
-            existing = deduped[seen[key]]
-            if link["confidence"] > existing["confidence"]:
-                deduped[seen[key]] = link
-        else:
-            seen[key] = len(deduped)
-            deduped.append(link)
-
-    return deduped
+    return links
@@ -6,14 +6,18 @@ Thin GPUStack client — wraps openai.OpenAI with GPUStack base URL.
 Includes exponential-backoff retry on transient failures.
 
 Usage:
-    from llm_client import generate
+    from llm_client import generate, generate_stream
     text = generate("Extract persons from: ...", system="You are an expert...")
+    for delta in generate_stream("Extract persons from: ..."):
+        ...
 """
 from __future__ import annotations
 
 import functools
 import logging
+import threading
 import time
+from collections.abc import Iterator
 from typing import Any
 
 import openai
@@ -28,19 +32,22 @@ from config import (
 
 logger = logging.getLogger(__name__)
 
-# Reusable client (singleton per process)
+# Reusable client (singleton per process; chunk requests share it across threads)
 _client: openai.OpenAI | None = None
+_client_lock = threading.Lock()
 
 
 def get_client() -> openai.OpenAI:
     """Return a shared OpenAI client pointed at GPUSTACK_BASE_URL."""
     global _client
     if _client is None:
-        _client = openai.OpenAI(
-            base_url=GPUSTACK_BASE_URL,
-            api_key=GPUSTACK_API_KEY or "dummy",
-            timeout=GPUSTACK_TIMEOUT,
-        )
+        with _client_lock:
+            if _client is None:
+                _client = openai.OpenAI(
+                    base_url=GPUSTACK_BASE_URL,
+                    api_key=GPUSTACK_API_KEY or "dummy",
+                    timeout=GPUSTACK_TIMEOUT,
+                )
     return _client
 
 
@@ -70,6 +77,14 @@ def with_retry(max_attempts: int = 3, base_delay: float = 2.0):
     return decorator
 
 
+def _build_messages(prompt: str, system: str | None) -> list[dict[str, str]]:
+    messages = []
+    if system:
+        messages.append({"role": "system", "content": system})
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
 @with_retry(max_attempts=3, base_delay=2.0)
 def generate(
     prompt: str,
@@ -90,16 +105,42 @@ def generate(
     Returns:
         The raw ``content`` string from the first assistant message.
     """
-    messages = []
-    if system:
-        messages.append({"role": "system", "content": system})
-    messages.append({"role": "user", "content": prompt})
     kwargs.setdefault("seed", EXTRACTION_SEED)
 
     client = get_client()
     resp = client.chat.completions.create(
         model=model or EXTRACTION_MODEL,
-        messages=messages,
+        messages=_build_messages(prompt, system),
         **kwargs,
     )
     return resp.choices[0].message.content or ""
+
+
+def generate_stream(
+    prompt: str,
+    *,
+    system: str | None = None,
+    model: str | None = None,
+    **kwargs: Any,
+) -> Iterator[str]:
+    """
+    Stream a chat completion from GPUStack, yielding content deltas.
+
+    Same arguments as ``generate``, but not retried here: once deltas have
+    been handed to the caller a retry would replay them. Callers retry the
+    whole request instead (see ``extract_persons._extract_gpustack_chunk``).
+    """
+    kwargs.setdefault("seed", EXTRACTION_SEED)
+
+    stream = get_client().chat.completions.create(
+        model=model or EXTRACTION_MODEL,
+        messages=_build_messages(prompt, system),
+        stream=True,
+        **kwargs,
+    )
+    for event in stream:
+        if not event.choices:
+            continue
+        delta = event.choices[0].delta.content
+        if delta:
+            yield delta
@@ -26,6 +26,11 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional speed-up: pip install -e '.[fast-json]'
+    orjson = None
+
 REPO      = Path(__file__).parent.parent
 STAGING   = REPO / "data" / "staging"
 RAW       = REPO / "data" / "raw"
@@ -37,17 +42,43 @@ PIPELINE  = REPO / "scripts" / "run_pipeline.py"
 def load_queue() -> list:
     if not QUEUE.exists():
         return []
-    return json.loads(QUEUE.read_text())
+    raw = QUEUE.read_bytes()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 
 def save_queue(q: list) -> None:
-    QUEUE.write_text(json.dumps(q, indent=2, ensure_ascii=False))
+    if orjson is not None:
+        payload = orjson.dumps(q, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(q, indent=2, ensure_ascii=False).encode("utf-8")
+    # Write-then-rename so a crash never leaves a half-written queue
+    tmp = QUEUE.with_name(QUEUE.name + ".tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, QUEUE)
 
 
 def find_item(q: list, item_id: str) -> dict | None:
     return next((x for x in q if x["id"] == item_id), None)
 
 
+def run_pipeline(args: list[str]) -> int:
+    """
+    Run run_pipeline.main in this interpreter, skipping a second interpreter
+    start-up and re-import. Falls back to a subprocess (preferring the repo
+    venv) when the pipeline's dependencies are not importable here.
+    """
+    try:
+        import run_pipeline as pipeline
+    except ImportError as exc:
+        print(f"Pipeline not importable in-process ({exc}); running it as a subprocess.")
+        py = str(VENV_PY) if VENV_PY.exists() else sys.executable
+        return subprocess.run([py, str(PIPELINE), *args], cwd=str(REPO)).returncode
+
+    # The pipeline's default paths are relative to the repo root
+    os.chdir(REPO)
+    return pipeline.main(args)
+
+
 def cmd_list() -> None:
     q = load_queue()
     pending = [x for x in q if x.get("status") == "pending"]
@@ -114,30 +145,18 @@ def cmd_process(item_id: str, reprocess_all: bool = False) -> None:
     item["raw_file"]     = dest.name
     save_queue(q)
 
-    # Determine Python executable
-    py = str(VENV_PY) if VENV_PY.exists() else sys.executable
-
     # Run pipeline — GPUStack config comes from .env.gpustack / environment
     gpustack_key = os.environ.get("GPUSTACK_API_KEY", "")
-    env = os.environ.copy()
 
     if reprocess_all:
         print(f"\nRunning pipeline on ENTIRE corpus (GPUSTACK_API_KEY {'set' if gpustack_key else 'NOT SET'})…")
-        result = subprocess.run(
-            [py, str(PIPELINE), "--input-dir", str(RAW), "--llm-metadata"],
-            cwd=str(REPO),
-            env=env,
-        )
+        returncode = run_pipeline(["--input-dir", str(RAW), "--llm-metadata"])
     else:
         print(f"\nRunning pipeline for '{dest.name}' only (GPUSTACK_API_KEY {'set' if gpustack_key else 'NOT SET'})…")
-        result = subprocess.run(
-            [py, str(PIPELINE), "--file", str(dest), "--llm-metadata"],
-            cwd=str(REPO),
-            env=env,
-        )
-    if result.returncode != 0:
+        returncode = run_pipeline(["--file", str(dest), "--llm-metadata"])
+    if returncode != 0:
         print("Pipeline failed.")
-        sys.exit(result.returncode)
+        sys.exit(returncode)
 
     print("\nPipeline complete.")
 
@@ -8,7 +8,7 @@ Usage
 ─────
     python scripts/run_pipeline.py [--input-dir data/raw] [--site-dir site] \
         [--bib-dir bib] [--outremer-index scripts/outremer_index.json] \
-        [--llm-metadata]
+        [--llm-metadata] [--workers N] [--skip-unchanged]
 
 GPUSTACK_BASE_URL (from .env.gpustack) activates GPUStack extraction;
 falls back to heuristic NER if absent.
@@ -16,13 +16,17 @@ falls back to heuristic NER if absent.
 from __future__ import annotations
 
 import argparse
+import contextlib
 import hashlib
+import importlib.metadata
+import importlib.util
 import json
 import logging
 import os
 import re
-import sys
 from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -33,7 +37,19 @@ from linker import build_authority_lookup, link_voyagers_to_outremer, normalise
 from llm_client import generate as _llm_generate
 from validate_decisions import validate_decisions_file
 
-from config import EXTRACTION_MODEL, EXTRACTION_SEED, GPUSTACK_BASE_URL, OCR_ENGINE
+try:
+    import orjson
+except ImportError:  # optional speed-up: pip install -e '.[fast-json]'
+    orjson = None
+
+from config import (
+    EXTRACTION_MODEL,
+    EXTRACTION_SEED,
+    GPUSTACK_BASE_URL,
+    OCR_ENGINE,
+    PDF_TEXT_CACHE_DIR,
+    PDF_TEXT_ENGINE,
+)
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
@@ -103,13 +119,38 @@ def _write_run_report(
 
 
 
+_SLUG_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_SLUG_DASHES_RE = re.compile(r"-+")
+
+
 def slugify(name: str) -> str:
     s = name.lower().strip()
-    s = re.sub(r"[^a-z0-9]+", "-", s)
-    s = re.sub(r"-+", "-", s).strip("-")
+    s = _SLUG_NON_ALNUM_RE.sub("-", s)
+    s = _SLUG_DASHES_RE.sub("-", s).strip("-")
     return s or "doc"
 
 
+def _dump_json(data: Any) -> bytes:
+    """``json.dumps(data, ensure_ascii=False, indent=2)`` as UTF-8, via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _write_if_changed(path: Path, data: bytes) -> bool:
+    """Write *data* to *path* unless it already holds exactly those bytes.
+
+    Leaves mtimes alone on re-runs, so downstream steps keyed on them don't rebuild.
+    """
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
 def sha256_text(t: str) -> str:
     return hashlib.sha256(t.encode("utf-8")).hexdigest()
 
@@ -123,8 +164,7 @@ def read_text_file(path: Path) -> str:
     return path.read_text(encoding="utf-8", errors="replace")
 
 
-def read_pdf_file(path: Path) -> str:
-    """Extract text from PDF and route image-only documents to recognition."""
+def _pdf_pages_pypdf(path: Path) -> list[str]:
     try:
         from pypdf import PdfReader
     except ImportError as exc:
@@ -132,14 +172,82 @@ def read_pdf_file(path: Path) -> str:
             "pypdf is required to read PDFs. Install with: pip install pypdf"
         ) from exc
     reader = PdfReader(str(path))
+    return [page.extract_text() or "" for page in reader.pages]
+
+
+def _pdf_pages_pdfium(path: Path) -> list[str]:
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(str(path))
     parts: list[str] = []
-    for page in reader.pages:
-        parts.append(page.extract_text() or "")
+    try:
+        for page in pdf:
+            textpage = page.get_textpage()
+            # PDFium ends lines with CRLF; pypdf and the rest of the pipeline use LF
+            parts.append(textpage.get_text_bounded().replace("\r\n", "\n"))
+            textpage.close()
+            page.close()
+    finally:
+        pdf.close()
+    return parts
+
+
+def _pdf_text_cache_path(path: Path, engine: str) -> Path | None:
+    """Cache file for *path*'s text layer, keyed by content hash and backend version."""
+    if not PDF_TEXT_CACHE_DIR:
+        return None
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    dist = "pypdfium2" if engine == "pdfium" else "pypdf"
+    try:
+        backend = f"{engine}-{importlib.metadata.version(dist)}"
+    except importlib.metadata.PackageNotFoundError:
+        backend = engine
+    return Path(PDF_TEXT_CACHE_DIR) / f"{digest.hexdigest()}.{backend}.txt"
+
+
+def _pdf_text_layer(path: Path) -> str:
+    """Embedded text of *path*, served from PDF_TEXT_CACHE_DIR when possible."""
+    engine = PDF_TEXT_ENGINE
+    if engine == "pdfium" and importlib.util.find_spec("pypdfium2") is None:
+        logger.warning(
+            "PDF_TEXT_ENGINE=pdfium but pypdfium2 is not installed "
+            "(pip install -e '.[fast-pdf]'); using pypdf."
+        )
+        engine = "pypdf"
+    cache_path = _pdf_text_cache_path(path, engine)
+    if cache_path is not None and cache_path.is_file():
+        return cache_path.read_text(encoding="utf-8")
+
+    parts = _pdf_pages_pdfium(path) if engine == "pdfium" else _pdf_pages_pypdf(path)
     text = "\n".join(parts).strip()
+    if cache_path is not None:
+        # Write-then-rename so parallel workers never read a partial entry.
+        # Best effort: a read-only tree must not break extraction.
+        tmp = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, cache_path)
+        except OSError as exc:
+            logger.warning("Could not cache PDF text for %s: %s", path.name, exc)
+            with contextlib.suppress(OSError):
+                tmp.unlink()
+    return text
+
+
+def read_pdf_file(path: Path) -> str:
+    """Extract text from PDF and route image-only documents to recognition."""
+    text = _pdf_text_layer(path)
 
     # Heuristic: if we got very little text, it's probably a scanned/image PDF
     if len(text) < 200:
-        logger.info("Low text yield from pypdf (%d chars) — trying OCR (engine=%s)…", len(text), OCR_ENGINE)
+        logger.info(
+            "Low text yield from %s (%d chars) — trying OCR (engine=%s)…",
+            path.name, len(text), OCR_ENGINE,
+        )
         ocr_text = _ocr_image(path)
         if ocr_text:
             logger.info("Recognition returned %d chars.", len(ocr_text))
@@ -254,8 +362,9 @@ def load_outremer_index(path: Path, *, require: bool = False) -> dict[str, Any]:
         logger.warning(msg)
         return {"entities": [], "persons": []}
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError as exc:
+        raw = path.read_bytes()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except ValueError as exc:  # json.JSONDecodeError and orjson.JSONDecodeError
         raise ValueError(f"Outremer index is not valid JSON: {path}") from exc
     # The index uses "persons" key (authority file format)
     return data
@@ -412,6 +521,31 @@ def sync_feedback_from_human_review(
 
 # ──────────────────────────────────────────────
 
+def _previous_doc_stats(
+    json_path: Path, outputs: list[Path], text_hash: str, language: str | None
+) -> dict[str, Any] | None:
+    """doc_stats of an earlier run over the same text, or None if it must be rebuilt.
+
+    The document JSON records ``text_sha256`` and ``language_hint``; when both
+    match and every output file is still present, extraction and linking can
+    be skipped.
+    """
+    if not all(o.exists() for o in outputs):
+        return None
+    payload = _load_json_file(json_path, {})
+    if (
+        not isinstance(payload, dict)
+        or payload.get("text_sha256") != text_hash
+        or payload.get("language_hint") != language
+    ):
+        return None
+    return {
+        "persons": len(payload.get("persons") or []),
+        "noise": (payload.get("quality") or {}).get("noise") or {},
+        "engine": payload.get("extraction_engine") or {},
+    }
+
+
 def process_file(
     in_path: Path,
     site_data_dir: Path,
@@ -423,13 +557,31 @@ def process_file(
     entity_feedback_path: Path | None = None,
     evidence_dir: Path | None = None,
     site_evidence_dir: Path | None = None,
+    skip_unchanged: bool = False,
 ) -> tuple[Path, Path, Path, Path | None, dict[str, Any]]:
     logger.info("Processing %s …", in_path.name)
     text = read_input(in_path)
 
     base = slugify(in_path.stem)
-    doc_hash = sha256_text(text)[:12]
-    doc_id = f"{base}-{doc_hash}"
+    text_hash = sha256_text(text)
+    doc_id = f"{base}-{text_hash[:12]}"
+
+    json_path = site_data_dir / f"{doc_id}.json"
+    bib_path_repo = bib_dir / f"{doc_id}.bib"
+    bib_path_site = site_bib_dir / f"{doc_id}.bib"
+
+    if skip_unchanged:
+        outputs = [json_path, bib_path_repo, bib_path_site]
+        evidence_path = None
+        if evidence_dir is not None:
+            evidence_path = evidence_dir / f"{doc_id}.evidence.json"
+            outputs.append(evidence_path)
+            if site_evidence_dir is not None:
+                outputs.append(site_evidence_dir / evidence_path.name)
+        doc_stats = _previous_doc_stats(json_path, outputs, text_hash, language)
+        if doc_stats is not None:
+            logger.info("  → unchanged since last run (%s); skipped.", json_path.name)
+            return json_path, bib_path_repo, bib_path_site, evidence_path, doc_stats
 
     result = extract_persons_and_metadata(
         text,
@@ -451,7 +603,7 @@ def process_file(
         "metadata": metadata,
         "persons": persons,
         "links": links,
-        "text_sha256": sha256_text(text),
+        "text_sha256": text_hash,
         # Provenance: which engine actually produced these persons
         "extraction_mode": (result.get("engine") or {}).get("provider", "unknown"),
         "extraction_engine": result.get("engine") or {},
@@ -459,13 +611,10 @@ def process_file(
         "quality": result.get("quality") or {},
     }
 
-    json_path = site_data_dir / f"{doc_id}.json"
-    bib_path_repo = bib_dir / f"{doc_id}.bib"
-    bib_path_site = site_bib_dir / f"{doc_id}.bib"
-
-    json_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    bib_path_repo.write_text(bibtex, encoding="utf-8")
-    bib_path_site.write_text(bibtex, encoding="utf-8")
+    _write_if_changed(json_path, _dump_json(payload))
+    bibtex_bytes = bibtex.encode("utf-8")
+    _write_if_changed(bib_path_repo, bibtex_bytes)
+    _write_if_changed(bib_path_site, bibtex_bytes)
     evidence_path = None
     if evidence_dir is not None:
         evidence = build_evidence_dataset(
@@ -506,6 +655,59 @@ def process_file(
     return json_path, bib_path_repo, bib_path_site, evidence_path, doc_stats
 
 
+_worker_authority_lookup: list[dict[str, Any]] = []
+
+
+def _init_worker(authority_lookup: list[dict[str, Any]]) -> None:
+    """Pool initializer: ship the authority lookup once per worker, not per file."""
+    global _worker_authority_lookup
+    _worker_authority_lookup = authority_lookup
+
+
+def _process_file_worker(
+    in_path: Path, file_kwargs: dict[str, Any]
+) -> tuple[tuple[Path, Path, Path, Path | None, dict[str, Any]], dict[str, int]]:
+    """``process_file`` in a pool worker.
+
+    Also returns the recognition engines used for this file: the worker's
+    ``_recognition_engines_used`` never reaches the parent's run report.
+    """
+    _recognition_engines_used.clear()
+    result = process_file(in_path, authority_lookup=_worker_authority_lookup, **file_kwargs)
+    return result, dict(_recognition_engines_used)
+
+
+def _iter_processed(
+    inputs: list[Path],
+    authority_lookup: list[dict[str, Any]],
+    file_kwargs: dict[str, Any],
+    workers: int,
+) -> Iterator[tuple[Path, Any]]:
+    """Yield ``(path, process_file result or the exception it raised)`` in input order."""
+    if workers <= 1 or len(inputs) < 2:
+        for p in inputs:
+            try:
+                yield p, process_file(p, authority_lookup=authority_lookup, **file_kwargs)
+            except Exception as exc:
+                yield p, exc
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(inputs)),
+        initializer=_init_worker,
+        initargs=(authority_lookup,),
+    ) as pool:
+        futures = [(p, pool.submit(_process_file_worker, p, file_kwargs)) for p in inputs]
+        for p, future in futures:
+            try:
+                result, engines = future.result()
+            except Exception as exc:
+                yield p, exc
+                continue
+            _recognition_engines_used.update(engines)
+            yield p, result
+
+
 def build_site_index(site_data_dir: Path, site_dir: Path) -> None:
     _EXCLUDE = {"wikidata_matches.json", "authority.json"}
     files = sorted(f for f in site_data_dir.glob("*.json") if f.name not in _EXCLUDE)
@@ -514,14 +716,14 @@ def build_site_index(site_data_dir: Path, site_dir: Path) -> None:
         "count": len(files),
         "documents": [f.name for f in files],
     }
-    (site_dir / "index.json").write_text(json.dumps(index, indent=2), encoding="utf-8")
+    _write_if_changed(site_dir / "index.json", json.dumps(index, indent=2).encode("utf-8"))
 
 
 # ──────────────────────────────────────────────
 # CLI
 # ──────────────────────────────────────────────
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     _recognition_engines_used.clear()
     ap = argparse.ArgumentParser(description="Outremer NER + KG linking pipeline.")
     ap.add_argument("--input-dir", default="data/raw", help="Folder with .txt/.pdf files")
@@ -577,7 +779,23 @@ def main() -> int:
         default=1,
         help="Min accept votes required to add a term to allow_terms",
     )
-    args = ap.parse_args()
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Documents processed in parallel worker processes (default 1; 0 = one "
+        "per CPU). Each worker runs its own extraction requests, so keep this within what the "
+        "GPUStack endpoint can serve concurrently. Concurrent documents do not see "
+        "each other's auto-flagged feedback terms from the same run.",
+    )
+    ap.add_argument(
+        "--skip-unchanged",
+        action="store_true",
+        help="Reuse a document's existing outputs when its text_sha256 matches the "
+        "input text, instead of re-running extraction and linking. Leave off after "
+        "changing prompts, filters or the authority file.",
+    )
+    args = ap.parse_args(argv)
 
     in_dir = Path(args.input_dir)
     site_dir = Path(args.site_dir)
@@ -665,48 +883,50 @@ def main() -> int:
         inputs: list[Path] = [Path(f) for f in args.files]
         logger.info("Processing %d specified file(s).", len(inputs))
     else:
-        inputs = sorted(set(list(in_dir.rglob("*.txt")) + list(in_dir.rglob("*.pdf"))))
+        # One walk for both types; suffixes stay case-sensitive like the old globs
+        inputs = sorted(p for p in in_dir.rglob("*") if p.suffix in (".txt", ".pdf"))
 
     errors: list[tuple[Path, Exception]] = []
     total_persons = 0
     noise_agg = {"extracted_total": 0, "filtered": 0}
     engine_docs: Counter[str] = Counter()
-    chunk_agg = {"chunks": 0, "fallback_chunks": 0}
+    chunk_agg = {"chunks": 0, "fallback_chunks": 0, "partial_chunks": 0}
     degrade_reasons: list[str] = []
     if not inputs:
         logger.warning("No .txt or .pdf files found in %s", in_dir)
     else:
-        for p in inputs:
-            try:
-                json_path, bib_repo, bib_site, evidence_path, doc_stats = process_file(
-                    p,
-                    site_data_dir=site_data_dir,
-                    bib_dir=bib_dir,
-                    site_bib_dir=site_bib_dir,
-                    authority_lookup=authority_lookup,
-                    use_llm_metadata=args.llm_metadata,
-                    language=args.language,
-                    entity_feedback_path=entity_feedback_path,
-                    evidence_dir=evidence_dir,
-                    site_evidence_dir=site_evidence_dir,
-                )
-                print(f"Wrote {json_path}")
-                print(f"Wrote {bib_repo}")
-                print(f"Wrote {bib_site}")
-                print(f"Wrote {evidence_path}")
-                total_persons += doc_stats["persons"]
-                for k in noise_agg:
-                    noise_agg[k] += (doc_stats.get("noise") or {}).get(k, 0)
-                eng = doc_stats.get("engine") or {}
-                engine_docs[eng.get("provider", "unknown")] += 1
-                for k in chunk_agg:
-                    chunk_agg[k] += eng.get(k, 0) or 0
-                for r in eng.get("degraded_reasons") or []:
-                    if r not in degrade_reasons:
-                        degrade_reasons.append(r)
-            except Exception as exc:
-                errors.append((p, exc))
-                logger.error("Failed processing %s: %s", p, exc)
+        file_kwargs = {
+            "site_data_dir": site_data_dir,
+            "bib_dir": bib_dir,
+            "site_bib_dir": site_bib_dir,
+            "use_llm_metadata": args.llm_metadata,
+            "language": args.language,
+            "entity_feedback_path": entity_feedback_path,
+            "evidence_dir": evidence_dir,
+            "site_evidence_dir": site_evidence_dir,
+            "skip_unchanged": args.skip_unchanged,
+        }
+        workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+        for p, outcome in _iter_processed(inputs, authority_lookup, file_kwargs, workers):
+            if isinstance(outcome, Exception):
+                errors.append((p, outcome))
+                logger.error("Failed processing %s: %s", p, outcome)
+                continue
+            json_path, bib_repo, bib_site, evidence_path, doc_stats = outcome
+            print(f"Wrote {json_path}")
+            print(f"Wrote {bib_repo}")
+            print(f"Wrote {bib_site}")
+            print(f"Wrote {evidence_path}")
+            total_persons += doc_stats["persons"]
+            for k in noise_agg:
+                noise_agg[k] += (doc_stats.get("noise") or {}).get(k, 0)
+            eng = doc_stats.get("engine") or {}
+            engine_docs[eng.get("provider", "unknown")] += 1
+            for k in chunk_agg:
+                chunk_agg[k] += eng.get(k, 0) or 0
+            for r in eng.get("degraded_reasons") or []:
+                if r not in degrade_reasons:
+                    degrade_reasons.append(r)
 
     build_site_index(site_data_dir=site_data_dir, site_dir=site_dir)
     print(f"Wrote {site_dir / 'index.json'}")
@@ -719,15 +939,19 @@ def main() -> int:
         shutil.copy2(authority_src, authority_dst)
         print(f"Copied authority file → {authority_dst}")
 
-    # Optional: Wikidata reconciliation for no_match persons
-    wikidata_script = Path(__file__).parent / "wikidata_reconcile.py"
-    if wikidata_script.exists():
+    # Optional: Wikidata reconciliation for no_match persons. Called in-process:
+    # a child interpreter only added start-up and re-import time.
+    try:
+        import wikidata_reconcile
+    except ImportError as exc:
+        logger.warning("Skipping Wikidata reconciliation: %s", exc)
+        wikidata_reconcile = None
+    if wikidata_reconcile is not None:
         logger.info("Running Wikidata reconciliation…")
-        import subprocess
-        subprocess.run(
-            [sys.executable, str(wikidata_script), "--site-dir", str(site_dir)],
-            cwd=str(Path(__file__).parent.parent),
-        )
+        try:
+            wikidata_reconcile.run(site_dir, limit=wikidata_reconcile.WD_CANDIDATE_LIMIT)
+        except Exception as exc:  # reconciliation is best-effort, as the subprocess was
+            logger.error("Wikidata reconciliation failed: %s", exc)
 
     _write_run_report(
         run_at=datetime.now(timezone.utc).isoformat(),
@@ -763,6 +987,13 @@ def main() -> int:
             f"heuristic NER ({', '.join(degrade_reasons) or 'unknown'}); "
             f"documents by engine: {dict(engine_docs)}"
         )
+    if chunk_agg["partial_chunks"]:
+        print(
+            f"::warning::extraction degraded — "
+            f"{chunk_agg['partial_chunks']}/{chunk_agg['chunks']} chunk(s) kept only a partial "
+            f"model response ({', '.join(degrade_reasons) or 'unknown'}); "
+            f"documents by engine: {dict(engine_docs)}"
+        )
 
     if errors:
         logger.error("Completed with %d error(s).", len(errors))
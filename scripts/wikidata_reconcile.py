@@ -14,15 +14,24 @@ unmatched persons alongside the authority-file candidates.
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import logging
 import re
+import threading
 import time
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
-from urllib.parse import urlencode
-from urllib.request import Request, urlopen
+
+import httpx
+
+try:
+    import orjson
+except ImportError:  # optional speed-up: pip install -e '.[fast-json]'
+    orjson = None
 
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
@@ -32,6 +41,8 @@ logger = logging.getLogger(__name__)
 WD_SPARQL    = "https://query.wikidata.org/sparql"
 WD_ENTITY    = "https://www.wikidata.org/wiki/{qid}"
 WD_API_DELAY = 0.5    # seconds between requests (be polite to SPARQL endpoint)
+WD_WORKERS   = 4      # persons reconciled concurrently; WD_API_DELAY still paces requests
+WD_CANDIDATE_LIMIT = 3  # candidates kept per person (CLI --limit default)
 USER_AGENT   = "outremer-poc/1.0 (https://github.com/thodel/outremer; tobias.hodel@unibe.ch)"
 
 # Medieval Levant-relevant keywords for scoring
@@ -42,61 +53,87 @@ DESCRIPTION_WHITELIST_RE = re.compile(
     re.I,
 )
 
+# Penalised: descriptions of clearly modern entities
+MODERN_DESCRIPTION_RE = re.compile(
+    r"\b(born 1[5-9]\d\d|20th|21st century|politician|athlete|actor)\b", re.I
+)
+
 # Cutoff: exclude persons who lived entirely after 1500 CE
 MEDIEVAL_CUTOFF_YEAR = 1500
 
+_WHITESPACE_RE = re.compile(r"\s+")
+_YEAR_RE = re.compile(r"(\d{4})")
+
 
+def _loads(raw: bytes) -> Any:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _dumps(data: Any) -> bytes:
+    """``json.dumps(data, ensure_ascii=False, indent=2)`` as UTF-8, via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+@functools.lru_cache(maxsize=8192)
 def normalise(s: str) -> str:
     s = unicodedata.normalize("NFKD", s)
     s = "".join(c for c in s if not unicodedata.combining(c))
-    return re.sub(r"\s+", " ", s).lower().strip()
+    return _WHITESPACE_RE.sub(" ", s).lower().strip()
 
 
-def get_person_dates(qid: str) -> tuple[int | None, int | None]:
-    """
-    Fetch birth (P569) and death (P570) years for a Wikidata entity.
-    Returns (birth_year, death_year) or (None, None) if unavailable.
-    """
-    sparql = f"""
-SELECT ?birth ?death WHERE {{
-  wd:{qid} wdt:P569 ?birth .
-  OPTIONAL {{ wd:{qid} wdt:P570 ?death . }}
-}}
-"""
-    params = urlencode({"query": sparql, "format": "json"})
-    url = f"{WD_SPARQL}?{params}"
-    req = Request(url, headers={
-        "User-Agent": USER_AGENT,
-        "Accept": "application/sparql-results+json",
-    })
-    try:
-        with urlopen(req, timeout=10) as r:
-            data = json.loads(r.read())
-        bindings = data.get("results", {}).get("bindings", [])
-        if not bindings:
-            return None, None
-
-        birth_year = None
-        death_year = None
-
-        for b in bindings:
-            birth_val = b.get("birth", {}).get("value", "")
-            death_val = b.get("death", {}).get("value", "")
-
-            # Parse ISO dates (e.g., "1145-01-01T00:00:00Z")
-            if birth_val and not birth_year:
-                match = re.match(r'(\d{4})', birth_val)
-                if match:
-                    birth_year = int(match.group(1))
-            if death_val and not death_year:
-                match = re.match(r'(\d{4})', death_val)
-                if match:
-                    death_year = int(match.group(1))
-
-        return birth_year, death_year
-    except Exception as e:
-        logger.debug(f"Failed to fetch dates for {qid}: {e}")
-        return None, None
+_throttle_lock = threading.Lock()
+_last_request_at = 0.0
+
+
+def _throttle() -> None:
+    """Space request starts at least WD_API_DELAY apart across all threads."""
+    global _last_request_at
+    with _throttle_lock:
+        wait = _last_request_at + WD_API_DELAY - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _last_request_at = time.monotonic()
+
+
+# Shared keep-alive client: the worker threads reuse pooled TCP/TLS
+# connections to WD_SPARQL instead of handshaking on every lookup.
+_http_client: httpx.Client | None = None
+_http_client_lock = threading.Lock()
+
+
+def _get_http_client() -> httpx.Client:
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = httpx.Client(
+                    headers={
+                        "User-Agent": USER_AGENT,
+                        "Accept": "application/sparql-results+json",
+                    },
+                    limits=httpx.Limits(max_keepalive_connections=WD_WORKERS),
+                    follow_redirects=True,
+                )
+    return _http_client
+
+
+def _sparql_bindings(sparql: str, timeout: float) -> list[dict[str, Any]]:
+    """Run a query against WD_SPARQL and return its result bindings."""
+    _throttle()
+    response = _get_http_client().get(
+        WD_SPARQL, params={"query": sparql, "format": "json"}, timeout=timeout
+    )
+    response.raise_for_status()
+    data = _loads(response.content)
+    return data.get("results", {}).get("bindings", [])
+
+
+def _year(value: str) -> int | None:
+    """Year of an ISO date literal (e.g. "1145-01-01T00:00:00Z"), else None."""
+    match = _YEAR_RE.match(value)
+    return int(match.group(1)) if match else None
 
 
 def is_medieval_person(birth_year: int | None, death_year: int | None) -> bool:
@@ -131,14 +168,19 @@ def wd_search_humans(name: str, lang: str = "en", limit: int = 5) -> list[dict[s
     """
     Query Wikidata SPARQL endpoint for persons matching `name` that are
     instance-of human (P31=Q5). Returns list of dicts with keys:
-    id, label, description.
+    id, label, description, birth_year, death_year.
     Places, geographical features, and other non-human entities are excluded.
     We cast a wide inner search (20 candidates) and then apply P31=Q5 filter,
     so that lower-ranked persons aren't lost to non-human items near the top.
+
+    Birth (P569) and death (P570) dates come back in the same query, as
+    OPTIONAL columns; an entity has multiple rows when it has multiple dates.
+    Rows are ordered by search rank, and the first ``limit`` entities are
+    kept. Only entities with a birth date are dated.
     """
     safe_name = name.replace('"', '').replace('\\', '')
     sparql = f"""
-SELECT ?item ?itemLabel ?itemDescription WHERE {{
+SELECT ?item ?itemLabel ?itemDescription ?ordinal ?birth ?death WHERE {{
   SERVICE wikibase:mwapi {{
     bd:serviceParam wikibase:endpoint "www.wikidata.org" ;
                     wikibase:api "EntitySearch" ;
@@ -146,30 +188,44 @@ SELECT ?item ?itemLabel ?itemDescription WHERE {{
                     mwapi:language "{lang}" ;
                     mwapi:limit "20" .
     ?item wikibase:apiOutputItem mwapi:item .
+    ?ordinal wikibase:apiOrdinal true .
   }}
   ?item wdt:P31 wd:Q5 .
+  OPTIONAL {{ ?item wdt:P569 ?birth . }}
+  OPTIONAL {{ ?item wdt:P570 ?death . }}
   SERVICE wikibase:label {{ bd:serviceParam wikibase:language "{lang},en" . }}
 }}
-LIMIT {limit}
+ORDER BY ?ordinal
 """
-    params = urlencode({"query": sparql, "format": "json"})
-    url = f"{WD_SPARQL}?{params}"
-    req = Request(url, headers={
-        "User-Agent": USER_AGENT,
-        "Accept": "application/sparql-results+json",
-    })
-    with urlopen(req, timeout=15) as r:
-        data = json.loads(r.read())
-    bindings = data.get("results", {}).get("bindings", [])
-    results = []
+    bindings = _sparql_bindings(sparql, timeout=15)
+    by_qid: dict[str, dict[str, Any]] = {}
     for b in bindings:
-        qid   = b["item"]["value"].rsplit("/", 1)[-1]
-        label = b.get("itemLabel", {}).get("value", "")
-        desc  = b.get("itemDescription", {}).get("value", "")
+        qid = b["item"]["value"].rsplit("/", 1)[-1]
+        entry = by_qid.get(qid)
+        if entry is None:
+            if len(by_qid) == limit:
+                continue
+            entry = by_qid[qid] = {
+                "id": qid,
+                "label": b.get("itemLabel", {}).get("value", ""),
+                "description": b.get("itemDescription", {}).get("value", ""),
+                "birth_year": None,
+                "death_year": None,
+            }
+        # First parsable value wins
+        if entry["birth_year"] is None:
+            entry["birth_year"] = _year(b.get("birth", {}).get("value", ""))
+        if entry["death_year"] is None:
+            entry["death_year"] = _year(b.get("death", {}).get("value", ""))
+
+    results = []
+    for entry in by_qid.values():
         # Skip if label is just the QID (no useful label)
-        if label == qid:
+        if entry["label"] == entry["id"]:
             continue
-        results.append({"id": qid, "label": label, "description": desc})
+        if entry["birth_year"] is None:
+            entry["death_year"] = None  # death alone never dated a candidate
+        results.append(entry)
     return results
 
 
@@ -179,9 +235,10 @@ def score_candidate(name: str, cand: dict) -> float:
 
     # Label similarity
     label = cand.get("label") or cand.get("display", {}).get("label", {}).get("value", "")
-    if normalise(label) == normalise(name):
+    n_name, n_label = normalise(name), normalise(label)
+    if n_label == n_name:
         score += 0.5
-    elif normalise(name) in normalise(label) or normalise(label) in normalise(name):
+    elif n_name in n_label or n_label in n_name:
         score += 0.3
 
     # Description relevance (medieval/crusades keywords)
@@ -190,7 +247,7 @@ def score_candidate(name: str, cand: dict) -> float:
         score += 0.4
 
     # Penalize clearly modern entities
-    if re.search(r"\b(born 1[5-9]\d\d|20th|21st century|politician|athlete|actor)\b", desc, re.I):
+    if MODERN_DESCRIPTION_RE.search(desc):
         score -= 0.5
 
     return max(0.0, min(1.0, score))
@@ -201,16 +258,17 @@ def score_candidate(name: str, cand: dict) -> float:
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
-def reconcile_person(name: str, limit: int = 3) -> list[dict[str, Any]]:
+def reconcile_person(name: str, limit: int = WD_CANDIDATE_LIMIT) -> list[dict[str, Any]] | None:
     """Return top Wikidata human candidates for a person name (P31=Q5 only).
     
     Filters out post-medieval persons (born after 1500) when dates are available.
+    Returns None when the lookup itself failed, so it is not cached as "no match".
     """
     try:
         results = wd_search_humans(name, limit=limit + 5)
     except Exception as e:
         print(f"  Wikidata error for '{name}': {e}")
-        return []
+        return None
 
     candidates = []
     filtered_count = 0
@@ -220,8 +278,8 @@ def reconcile_person(name: str, limit: int = 3) -> list[dict[str, Any]]:
         if not qid.startswith("Q"):
             continue
 
-        # Check birth/death dates to filter post-medieval persons
-        birth_year, death_year = get_person_dates(qid)
+        # Filter post-medieval persons by the dates the search returned
+        birth_year, death_year = r.get("birth_year"), r.get("death_year")
         if not is_medieval_person(birth_year, death_year):
             logger.debug(f"  Filtered post-medieval: {r.get('label', qid)} (b.{birth_year}, d.{death_year})")
             filtered_count += 1
@@ -260,18 +318,28 @@ def run(site_dir: Path, limit: int) -> None:
     existing: dict[str, Any] = {}
     if out_file.exists():
         try:
-            existing = json.loads(out_file.read_text())
+            existing = _loads(out_file.read_bytes())
         except Exception:
             existing = {}
 
     doc_files = sorted(data_dir.glob("*.json"))
     doc_files  = [f for f in doc_files if f.name != "wikidata_matches.json"]
 
-    total_queried = 0
+    # Reconciliation depends only on the name, so an answer stored under any
+    # document serves every other document that mentions the same person.
+    by_name: dict[str, dict[str, Any]] = {
+        key: entry
+        for bucket in existing.values() if isinstance(bucket, dict)
+        for key, entry in bucket.items()
+    }
+
     total_skipped = 0
+    pending: list[tuple[str, str, str]] = []  # (doc_id, key, person)
+    queued: set[tuple[str, str]] = set()
+    unique: dict[str, str] = {}  # key -> surface form sent to Wikidata
 
     for doc_path in doc_files:
-        doc = json.loads(doc_path.read_text())
+        doc = _loads(doc_path.read_bytes())
         doc_id = doc.get("doc_id", doc_path.stem)
 
         if doc_id not in existing:
@@ -298,29 +366,59 @@ def run(site_dir: Path, limit: int) -> None:
 
             key = normalise(person)
 
-            if key in existing[doc_id]:
+            if key in existing[doc_id] or (doc_id, key) in queued:
                 total_skipped += 1
                 continue   # already reconciled
 
-            print(f"  Querying: {person}")
-            candidates = reconcile_person(person, limit=limit)
-            existing[doc_id][key] = {
-                "person":     person,
-                "candidates": candidates,
-                "queried_at": __import__("datetime").datetime.utcnow().isoformat(),
-            }
-            total_queried += 1
-            time.sleep(WD_API_DELAY)
+            cached = by_name.get(key)
+            if cached is not None:
+                existing[doc_id][key] = {**cached, "person": person}
+                total_skipped += 1
+                continue
 
-    out_file.write_text(json.dumps(existing, ensure_ascii=False, indent=2))
-    print(f"\nDone. Queried {total_queried} new persons, skipped {total_skipped} cached.")
+            if key not in unique:
+                print(f"  Querying: {person}")
+                unique[key] = person
+            queued.add((doc_id, key))
+            pending.append((doc_id, key, person))
+
+    # Lookups are network-bound; overlap them and let _throttle pace the
+    # requests. Each distinct name is queried once, however many documents
+    # mention it, and the answer is fanned out in the main thread.
+    # Failed lookups are left out entirely: stored, they would read as "no
+    # match" and be reused for every document naming that person.
+    answers: dict[str, tuple[list[dict[str, Any]], str]] = {}
+    with ThreadPoolExecutor(max_workers=WD_WORKERS) as pool:
+        results = pool.map(lambda name: reconcile_person(name, limit=limit), unique.values())
+        for key, candidates in zip(unique, results):
+            if candidates is not None:
+                answers[key] = (candidates, datetime.now(timezone.utc).isoformat())
+    for doc_id, key, person in pending:
+        if key not in answers:
+            continue
+        candidates, queried_at = answers[key]
+        existing[doc_id][key] = {
+            "person":     person,
+            "candidates": candidates,
+            "queried_at": queried_at,
+        }
+    total_queried = len(unique)
+    total_failed = total_queried - len(answers)
+
+    out_file.write_bytes(_dumps(existing))
+    print(
+        f"\nDone. Queried {total_queried} new persons ({total_failed} failed, retried next run), "
+        f"skipped {total_skipped} cached."
+    )
     print(f"Output: {out_file}")
 
 
 def main() -> None:
     ap = argparse.ArgumentParser(description="Wikidata reconciliation for unmatched Outremer persons.")
     ap.add_argument("--site-dir", default="site")
-    ap.add_argument("--limit", type=int, default=3, help="Max Wikidata candidates per person")
+    ap.add_argument(
+        "--limit", type=int, default=WD_CANDIDATE_LIMIT, help="Max Wikidata candidates per person"
+    )
     args = ap.parse_args()
     run(Path(args.site_dir), args.limit)
 
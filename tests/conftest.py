@@ -1,9 +1,24 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 SCRIPTS = ROOT / "scripts"
 
 for p in (str(SCRIPTS), str(ROOT)):
     if p not in sys.path:
         sys.path.insert(0, p)
+
+
+@pytest.fixture(autouse=True)
+def _no_pdf_text_cache(monkeypatch):
+    """Keep tests out of the on-disk PDF text-layer cache in the checkout.
+
+    A hit there would bypass monkeypatched extractors; tests that exercise
+    the cache point PDF_TEXT_CACHE_DIR at tmp_path themselves.
+    """
+    for name in ("run_pipeline", "scripts.run_pipeline"):
+        module = sys.modules.get(name)
+        if module is not None:
+            monkeypatch.setattr(module, "PDF_TEXT_CACHE_DIR", "")
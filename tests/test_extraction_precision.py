@@ -218,5 +218,40 @@ def test_clean_run_still_reports_gpustack(monkeypatch):
     assert res["engine"]["fallback_chunks"] == 0
 
 
+def test_partial_chunk_is_reported_as_degraded(monkeypatch):
+    import extract_persons as E
+
+    monkeypatch.setattr(
+        E, "_extract_gpustack_chunk",
+        lambda *a, **k: {"persons": [{"name": "Godfrey"}], "metadata": {}, "degraded": "ReadTimeout"},
+    )
+    monkeypatch.setenv("GPUSTACK_BASE_URL", "https://example.invalid/v1")
+    res = E.extract_persons_and_metadata("Godfrey took the cross.", use_llm_metadata=False)
+    eng = res["engine"]
+    assert eng["provider"] == "gpustack_partial"
+    assert eng["fallback_chunks"] == 0
+    assert eng["partial_chunks"] == eng["chunks"] == 1
+    assert eng["degraded_reasons"] == ["ReadTimeout"]
+    assert [p["name"] for p in res["persons"]] == ["Godfrey"]
+
+
+def test_concurrent_chunks_merge_in_chunk_order(monkeypatch):
+    import time
+
+    import extract_persons as E
+
+    import config
+
+    def chunk_result(chunk, **kwargs):
+        time.sleep(0.05 if chunk == "first" else 0.0)  # first chunk finishes last
+        return {"persons": [{"name": chunk.title()}], "metadata": {}}
+
+    monkeypatch.setattr(config, "EXTRACTION_CONCURRENCY", 2)
+    monkeypatch.setattr(E, "_pack_chunks", lambda text: [(0, "first"), (40, "second")])
+    monkeypatch.setattr(E, "_extract_gpustack_chunk", chunk_result)
+    res = E._extract_gpustack("ignored", use_llm_metadata=False)
+    assert [p["name"] for p in res["persons"]] == ["First", "Second"]
+
+
 def _raise_403(*args, **kwargs):
     raise RuntimeError("403 Forbidden: Access denied")
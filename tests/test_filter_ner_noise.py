@@ -0,0 +1,62 @@
+"""Tests for the post-extraction noise filter in scripts/filter_ner_noise.py."""
+
+import json
+
+from filter_ner_noise import (
+    filter_persons,
+    has_medieval_pattern,
+    is_bibliographic_noise,
+    process_file,
+)
+
+
+def test_exact_and_multiword_blacklist_terms_are_noise():
+    assert is_bibliographic_noise("  Review ")
+    assert is_bibliographic_noise("Proceedings of the Royal Society")
+    assert is_bibliographic_noise("Cambridge University Press")
+    assert not is_bibliographic_noise("Baldwin of Boulogne")
+
+
+def test_noise_patterns_match_from_start_of_name():
+    for name in ("1099", "Vol. 3", "pp. 12-14", "the King", "ibid."):
+        assert is_bibliographic_noise(name), name
+    assert not is_bibliographic_noise("Raymond of Toulouse")
+
+
+def test_medieval_patterns_are_case_insensitive():
+    assert has_medieval_pattern("IBN AL-ATHIR")
+    assert has_medieval_pattern("King Louis")
+
+
+def test_filter_persons_drops_noise_and_modern_scholars():
+    doc = {
+        "persons": [
+            {"name": "Godfrey of Bouillon", "confidence": 0.9, "context": "took the cross"},
+            {"name": "Vol 3", "confidence": 0.9},
+            {"name": "Mayer", "confidence": 0.9, "context": "as Mayer argues"},
+            {"name": "X"},
+        ],
+        "links": [
+            {"person": "Godfrey of Bouillon", "status": "high"},
+            {"person": "University Press", "status": "high"},
+            {"person": "Tancred", "status": "low"},
+        ],
+    }
+    out = filter_persons(doc)
+    assert [p["name"] for p in out["persons"]] == ["Godfrey of Bouillon"]
+    assert [link["person"] for link in out["links"]] == ["Godfrey of Bouillon"]
+    assert out["_filter_metadata"]["removed"] == 3
+
+
+def test_process_file_splice_matches_full_reencode(tmp_path):
+    doc = {
+        "doc_id": "d",
+        "persons": [{"name": "Godfrey of Bouillon", "confidence": 0.9, "context": "took the cross"}],
+        "links": [{"person": "Godfrey of Bouillon", "status": "high"}],
+    }
+    src = tmp_path / "in.json"
+    src.write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
+    process_file(src, tmp_path / "out.json")
+
+    expected = json.dumps(filter_persons(doc), ensure_ascii=False, indent=2)
+    assert (tmp_path / "out.json").read_text(encoding="utf-8") == expected
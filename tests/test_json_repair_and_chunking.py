@@ -7,10 +7,15 @@ model returns malformed or truncated JSON.
 
 import json
 
+import extract_persons
+import llm_client
 from extract_persons import (
     _chunk_text,
+    _extract_gpustack_chunk,
+    _pack_chunks,
     _recover_truncated_json,
     _repair_json,
+    _StreamingPersonsParser,
 )
 
 # ── _repair_json ─────────────────────────────────────────────────────────────
@@ -51,6 +56,73 @@ def test_recover_handles_input_without_persons_array():
     assert result == {"persons": [], "metadata": {}}
 
 
+def test_streaming_parser_yields_persons_as_their_objects_close():
+    parser = _StreamingPersonsParser()
+    deltas = [
+        '{"pers', 'ons": [{"name": "Godfrey", "context": "a {brace} in', ' text"},',
+        ' {"name": "Tan', 'cred"}, {"name": "Baldw',
+    ]
+    seen = [[p["name"] for p in parser.feed(d)] for d in deltas]
+    assert seen == [[], [], ["Godfrey"], [], ["Tancred"]]
+    assert parser.text == "".join(deltas)
+
+
+def test_streaming_parser_stops_at_end_of_persons_array():
+    parser = _StreamingPersonsParser()
+    found = parser.feed('{"persons": [{"name": "X"}], "metadata": {"title": "T"}}')
+    assert found == [{"name": "X"}]
+
+
+def _flaky_stream(responses, calls):
+    """Stand-in for generate_stream: each call replays the next response's
+    deltas, then raises if that response is an exception-terminated list."""
+    def stream(prompt, **kwargs):
+        deltas = responses[len(calls)]
+        calls.append(prompt)
+        for d in deltas:
+            if isinstance(d, Exception):
+                raise d
+            yield d
+    return stream
+
+
+def test_chunk_request_is_retried_from_scratch_after_mid_stream_failure(monkeypatch):
+    calls = []
+    monkeypatch.setattr(llm_client.time, "sleep", lambda _s: None)
+    monkeypatch.setattr(extract_persons, "_llm_generate_stream", _flaky_stream([
+        ['{"persons": [{"name": "Godfrey"}, ', TimeoutError("read timed out")],
+        ['{"persons": [{"name": "Godfrey"}, {"name": "Tancred"}], "metadata": {}}'],
+    ], calls))
+    result = _extract_gpustack_chunk("Godfrey and Tancred.")
+    assert len(calls) == 2
+    assert [p["name"] for p in result["persons"]] == ["Godfrey", "Tancred"]
+
+
+def test_persons_streamed_before_a_persistent_failure_are_kept(monkeypatch):
+    calls = []
+    monkeypatch.setattr(llm_client.time, "sleep", lambda _s: None)
+    monkeypatch.setattr(extract_persons, "_llm_generate_stream", _flaky_stream([
+        ['{"persons": [{"name": "Godfrey"}, ', ConnectionError("reset")],
+        ['{"persons": [{"name": "Godfrey"}, {"name": "Tancred"}, ', ConnectionError("reset")],
+        [ConnectionError("reset")],
+    ], calls))
+    result = _extract_gpustack_chunk("Godfrey and Tancred.")
+    assert len(calls) == 3
+    assert [p["name"] for p in result["persons"]] == ["Godfrey", "Tancred"]
+    assert result["degraded"] == "ConnectionError"
+
+
+def test_malformed_complete_response_keeps_its_metadata(monkeypatch):
+    raw = (
+        '{"persons": [{"name": "Godfrey", "context": "called "the Advocate""}, '
+        '{"name": "Tancred"}], "metadata": {"title": "Gesta", "year": 1100}}'
+    )
+    monkeypatch.setattr(extract_persons, "_llm_generate_stream", _flaky_stream([[raw]], []))
+    result = _extract_gpustack_chunk("Godfrey and Tancred.")
+    assert [p["name"] for p in result["persons"]] == ["Tancred"]
+    assert result["metadata"] == {"title": "Gesta", "year": 1100}
+
+
 # ── _chunk_text ──────────────────────────────────────────────────────────────
 
 def test_short_text_is_single_chunk():
@@ -74,3 +146,28 @@ def test_chunk_offsets_are_monotonic():
     offsets = [off for off, _ in chunks]
     assert offsets == sorted(offsets)
     assert offsets[0] == 0
+
+
+# ── _pack_chunks ─────────────────────────────────────────────────────────────
+
+def test_pack_keeps_document_under_budget_in_one_request():
+    text = "\n\n".join("para " + "x" * 300 for _ in range(10))
+    assert _pack_chunks(text, max_tokens=1_000) == [(0, text)]
+
+
+def test_pack_offsets_point_at_chunk_text():
+    text = "\n\n".join(f"Paragraph {i}. " + "y" * 300 for i in range(12))
+    chunks = _pack_chunks(text, max_tokens=250)
+    assert len(chunks) > 1
+    for off, chunk in chunks:
+        assert text[off:off + len(chunk)] == chunk
+    for i in range(12):
+        assert any(f"Paragraph {i}." in c for _, c in chunks)
+
+
+def test_pack_hard_splits_oversize_paragraph():
+    text = "short\n\n" + ". ".join("z" * 90 for _ in range(200)) + "\n\ntail"
+    chunks = _pack_chunks(text, max_tokens=500)
+    assert chunks[0] == (0, "short")
+    assert chunks[-1][1] == "tail"
+    assert len(chunks) > 3
@@ -98,3 +98,17 @@ def test_link_does_not_borrow_single_token_variant():
 
 def test_floor_is_config_backed():
     assert 0.0 < LINK_CANDIDATE_FLOOR < LINK_HIGH <= 1.0
+
+
+def test_blocked_shortlist_matches_full_scan():
+    # min_score=0 disables blocking, so every entry is scored; filtering that
+    # full scan at the floor must equal the blocked result exactly
+    persons = [
+        {"name": n}
+        for n in ["Godefroy de Bouillon", "Bouillon Godefroy", "Ralph of Caen", "Ralph", "Rafe II"]
+    ]
+    blocked = link_voyagers_to_outremer(persons, AUTHORITY, top_k=5)
+    full = link_voyagers_to_outremer(persons, AUTHORITY, top_k=5, min_score=0.0)
+    for b, f in zip(blocked, full, strict=True):
+        kept = [c for c in f["candidates"] if c["score"] >= LINK_CANDIDATE_FLOOR]
+        assert b["candidates"] == kept
@@ -10,7 +10,7 @@ from unittest.mock import MagicMock
 
 import llm_client
 import pytest
-from llm_client import generate, with_retry
+from llm_client import generate, generate_stream, with_retry
 
 
 def _response(content):
@@ -29,6 +29,13 @@ def fake_client(monkeypatch):
     return client
 
 
+def _stream(*deltas):
+    return [
+        SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=d))])
+        for d in deltas
+    ]
+
+
 def test_generate_builds_messages_with_system(fake_client):
     out = generate("the prompt", system="the system")
     assert out == "hello"
@@ -86,3 +93,22 @@ def test_with_retry_backoff_is_exponential(monkeypatch):
         flaky()
     assert calls["n"] == 3
     assert delays == [2.0, 4.0]
+
+
+def test_generate_stream_yields_non_empty_deltas(fake_client):
+    fake_client.chat.completions.create.return_value = (
+        _stream("{\"per", None, "sons\": []}", "") + [SimpleNamespace(choices=[])]
+    )
+    assert list(generate_stream("p")) == ['{"per', 'sons": []}']
+    kwargs = fake_client.chat.completions.create.call_args.kwargs
+    assert kwargs["stream"] is True
+    assert kwargs["seed"] == llm_client.EXTRACTION_SEED
+
+
+def test_generate_stream_leaves_retries_to_the_caller(fake_client):
+    # A retried stream would replay deltas already handed out; the caller
+    # retries the whole request with a fresh parser instead.
+    fake_client.chat.completions.create.side_effect = RuntimeError("boom")
+    with pytest.raises(RuntimeError, match="boom"):
+        list(generate_stream("p"))
+    assert fake_client.chat.completions.create.call_count == 1
@@ -0,0 +1,85 @@
+"""Incremental runs: --skip-unchanged reuse and leaving identical outputs untouched."""
+
+import os
+
+import pytest
+
+from scripts import run_pipeline
+
+
+@pytest.fixture
+def output_dirs(tmp_path):
+    """The three output folders process_file writes into."""
+    for d in ("site/data", "site/bib", "bib"):
+        (tmp_path / d).mkdir(parents=True)
+
+
+def _stub_extraction(monkeypatch, calls):
+    def extract(*args, **kwargs):
+        calls.append(1)
+        return {
+            "persons": [{"name": "Baldwin", "context": "Baldwin travelled.", "confidence": 0.8}],
+            "metadata": {"title": "Source"},
+            "bibtex": "@misc{source}",
+            "engine": {"provider": "test"},
+        }
+
+    monkeypatch.setattr(run_pipeline, "extract_persons_and_metadata", extract)
+    monkeypatch.setattr(run_pipeline, "link_voyagers_to_outremer", lambda *args: [])
+
+
+def _run(tmp_path, source, skip_unchanged=True):
+    return run_pipeline.process_file(
+        source,
+        site_data_dir=tmp_path / "site" / "data",
+        bib_dir=tmp_path / "bib",
+        site_bib_dir=tmp_path / "site" / "bib",
+        authority_lookup=[],
+        use_llm_metadata=False,
+        skip_unchanged=skip_unchanged,
+    )
+
+
+def test_unchanged_text_skips_extraction(monkeypatch, tmp_path, output_dirs):
+    source = tmp_path / "source.txt"
+    source.write_text("Baldwin travelled.", encoding="utf-8")
+    calls: list[int] = []
+    _stub_extraction(monkeypatch, calls)
+
+    first = _run(tmp_path, source)
+    second = _run(tmp_path, source)
+    assert len(calls) == 1
+    assert second[0] == first[0]
+    assert second[4]["persons"] == 1
+    assert second[4]["engine"] == {"provider": "test"}
+
+    source.write_text("Baldwin travelled east.", encoding="utf-8")
+    _run(tmp_path, source)
+    assert len(calls) == 2
+
+
+def test_missing_output_forces_rebuild(monkeypatch, tmp_path, output_dirs):
+    source = tmp_path / "source.txt"
+    source.write_text("Baldwin travelled.", encoding="utf-8")
+    calls: list[int] = []
+    _stub_extraction(monkeypatch, calls)
+
+    first = _run(tmp_path, source)
+    first[2].unlink()  # site copy of the BibTeX
+    _run(tmp_path, source)
+    assert len(calls) == 2
+    assert first[2].exists()
+
+
+def test_identical_outputs_are_not_rewritten(monkeypatch, tmp_path, output_dirs):
+    source = tmp_path / "source.txt"
+    source.write_text("Baldwin travelled.", encoding="utf-8")
+    calls: list[int] = []
+    _stub_extraction(monkeypatch, calls)
+
+    outputs = _run(tmp_path, source, skip_unchanged=False)[:3]
+    for out in outputs:
+        os.utime(out, ns=(1_000_000_000, 1_000_000_000))
+    _run(tmp_path, source, skip_unchanged=False)
+    assert len(calls) == 2
+    assert [out.stat().st_mtime_ns for out in outputs] == [1_000_000_000] * 3
@@ -0,0 +1,71 @@
+"""run_pipeline --workers N: documents processed on a process pool."""
+
+import json
+
+import extract_persons
+
+import config
+from scripts import run_pipeline
+
+
+def test_worker_pool_keeps_input_order_and_feedback_store_intact(monkeypatch, tmp_path):
+    # Heuristic extraction only: no GPUStack endpoint in the workers either.
+    monkeypatch.setattr(config, "GPUSTACK_BASE_URL", "")
+    for d in ("site/data", "site/bib", "bib"):
+        (tmp_path / d).mkdir(parents=True)
+    feedback_path = tmp_path / "entity_feedback.json"
+    feedback_path.write_text(
+        json.dumps({
+            "schema_version": 1,
+            "blocked_terms": ["Raymond of Toulouse"],
+            "allow_terms": ["Tancred"],
+        }),
+        encoding="utf-8",
+    )
+    inputs = []
+    for i in range(8):
+        src = tmp_path / f"source-{i}.txt"
+        src.write_text(
+            f"Document {i}. Baldwin of Boulogne met Tancred at Antioch with Raymond of Toulouse.",
+            encoding="utf-8",
+        )
+        inputs.append(src)
+    file_kwargs = {
+        "site_data_dir": tmp_path / "site" / "data",
+        "bib_dir": tmp_path / "bib",
+        "site_bib_dir": tmp_path / "site" / "bib",
+        "use_llm_metadata": False,
+        "entity_feedback_path": feedback_path,
+    }
+
+    outcomes = list(run_pipeline._iter_processed(inputs, [], file_kwargs, workers=4))
+
+    assert [p for p, _ in outcomes] == inputs
+    for _, outcome in outcomes:
+        assert not isinstance(outcome, Exception), outcome
+        doc = json.loads(outcome[0].read_text(encoding="utf-8"))
+        names = {p["name"] for p in doc["persons"]}
+        assert "Tancred" in names
+        assert "Raymond of Toulouse" not in names  # blocked term reached every worker
+    store = json.loads(feedback_path.read_text(encoding="utf-8"))
+    assert store["blocked_terms"] == ["Raymond of Toulouse"]
+    assert store["allow_terms"] == ["Tancred"]
+    assert not list(tmp_path.glob("entity_feedback.json.*.tmp"))
+
+
+def test_feedback_store_is_replaced_atomically(monkeypatch, tmp_path):
+    # Workers read the store without the lock; while a save is in flight
+    # they must still see the previous complete store.
+    path = str(tmp_path / "entity_feedback.json")
+    old = {"schema_version": 1, "blocked_terms": ["Vol"], "allow_terms": [], "auto_flagged": {}}
+    new = {**old, "blocked_terms": ["Vol", "Review"]}
+    extract_persons._save_entity_feedback(path, old)
+    real_replace = extract_persons.os.replace
+
+    def replace(src, dst):
+        assert extract_persons._load_entity_feedback(path) == old
+        real_replace(src, dst)
+
+    monkeypatch.setattr(extract_persons.os, "replace", replace)
+    extract_persons._save_entity_feedback(path, new)
+    assert extract_persons._load_entity_feedback(path) == new
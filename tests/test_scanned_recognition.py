@@ -54,6 +54,47 @@ def test_image_only_pdf_routes_to_recognition_and_records_engine(monkeypatch, tm
     assert report["recognition"]["engines_used"] == {"qwen3-vl": 1}
 
 
+def test_pdfium_engine_also_routes_image_only_pdf_to_recognition(monkeypatch):
+    pytest.importorskip("pypdfium2")
+    run_pipeline._recognition_engines_used.clear()
+    monkeypatch.setattr(run_pipeline, "PDF_TEXT_ENGINE", "pdfium")
+    monkeypatch.setattr(run_pipeline, "_qwen3vl_ocr", lambda path: "Johannes Dei gratia")
+    monkeypatch.setattr(run_pipeline, "_mistral_ocr", lambda path: "")
+
+    assert run_pipeline._pdf_pages_pdfium(FIXTURE) == [""]
+    assert run_pipeline.read_input(FIXTURE) == "Johannes Dei gratia"
+    assert run_pipeline._recognition_engines_used == {"qwen3-vl": 1}
+
+
+def test_pdf_text_layer_is_served_from_cache_on_rerun(monkeypatch, tmp_path):
+    src = tmp_path / "doc.pdf"
+    src.write_bytes(FIXTURE.read_bytes())
+    monkeypatch.setattr(run_pipeline, "PDF_TEXT_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(run_pipeline, "_pdf_pages_pypdf", lambda path: ["Rex Anglie "])
+
+    assert run_pipeline._pdf_text_layer(src) == "Rex Anglie"
+    assert len(list((tmp_path / "cache").glob("*.txt"))) == 1
+
+    def _must_not_parse(path):
+        raise AssertionError("cached text layer was re-extracted")
+
+    monkeypatch.setattr(run_pipeline, "_pdf_pages_pypdf", _must_not_parse)
+    assert run_pipeline._pdf_text_layer(src) == "Rex Anglie"
+
+    src.write_bytes(FIXTURE.read_bytes() + b"\n%changed\n")
+    with pytest.raises(AssertionError):
+        run_pipeline._pdf_text_layer(src)
+
+
+def test_unwritable_pdf_text_cache_does_not_break_extraction(monkeypatch, tmp_path):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("", encoding="utf-8")
+    monkeypatch.setattr(run_pipeline, "PDF_TEXT_CACHE_DIR", str(blocker / "cache"))
+    monkeypatch.setattr(run_pipeline, "_pdf_pages_pypdf", lambda path: ["Rex Anglie"])
+
+    assert run_pipeline._pdf_text_layer(FIXTURE) == "Rex Anglie"
+
+
 @pytest.mark.live_backend
 @pytest.mark.skipif(
     os.environ.get("OUTREMER_LIVE_OCR") != "1",
@@ -0,0 +1,168 @@
+"""Wikidata reconciliation with the SPARQL endpoint stubbed out."""
+
+import json
+
+import httpx
+import pytest
+import wikidata_reconcile as W
+
+ENTITY = "http://www.wikidata.org/entity/"
+
+
+def _row(qid, label, birth=None, death=None):
+    row = {"item": {"value": ENTITY + qid}, "itemLabel": {"value": label}}
+    if birth:
+        row["birth"] = {"value": birth}
+    if death:
+        row["death"] = {"value": death}
+    return row
+
+
+def test_sparql_requests_share_one_pooled_client(monkeypatch):
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.params["query"])
+        return httpx.Response(200, json={"results": {"bindings": [_row("Q1", "Baldwin I")]}})
+
+    monkeypatch.setattr(W, "WD_API_DELAY", 0.0)
+    monkeypatch.setattr(W, "_http_client", httpx.Client(transport=httpx.MockTransport(handler)))
+    client = W._get_http_client()
+
+    assert W._sparql_bindings("SELECT 1", timeout=5) == [_row("Q1", "Baldwin I")]
+    assert W._sparql_bindings("SELECT 2", timeout=5)
+    assert seen == ["SELECT 1", "SELECT 2"]
+    assert W._get_http_client() is client
+
+
+def test_search_returns_dates_from_the_same_query(monkeypatch):
+    queries = []
+
+    def bindings(sparql, timeout):
+        queries.append(sparql)
+        return [
+            _row("Q1", "Baldwin I", "1060-01-01T00:00:00Z", "1118-04-02T00:00:00Z"),
+            _row("Q1", "Baldwin I", "1061-01-01T00:00:00Z", "1118-04-02T00:00:00Z"),
+            _row("Q2", "Q2"),  # unlabelled: skipped, but counts toward the limit
+            _row("Q3", "Baldwin", death="1950-01-01T00:00:00Z"),
+            _row("Q4", "Baldwin IV"),  # beyond limit
+        ]
+
+    monkeypatch.setattr(W, "_sparql_bindings", bindings)
+    results = W.wd_search_humans("Baldwin", limit=3)
+    assert len(queries) == 1
+    assert "wdt:P569" in queries[0] and "ORDER BY ?ordinal" in queries[0]
+    assert [(r["id"], r["birth_year"], r["death_year"]) for r in results] == [
+        ("Q1", 1060, 1118),
+        ("Q3", None, None),  # death without birth left undated, as before
+    ]
+
+
+def test_reconcile_person_filters_post_medieval_candidates(monkeypatch):
+    monkeypatch.setattr(
+        W,
+        "wd_search_humans",
+        lambda name, limit: [
+            {"id": "Q1", "label": "Baldwin I", "description": "king of Jerusalem",
+             "birth_year": 1060, "death_year": 1118},
+            {"id": "Q2", "label": "Baldwin", "description": "American actor",
+             "birth_year": 1958, "death_year": 2020},
+        ],
+    )
+    candidates = W.reconcile_person("Baldwin I")
+    assert [c["qid"] for c in candidates] == ["Q1"]
+    assert candidates[0]["score"] == 0.9
+    assert (candidates[0]["birth_year"], candidates[0]["death_year"]) == (1060, 1118)
+
+
+def test_run_queries_each_unmatched_name_once_per_document(monkeypatch, tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    links = [
+        {"person": "Baldwin of Boulogne", "status": "no_match"},
+        {"person": "Baldwin of  Boulogne", "status": "no_match"},
+        {"person": "Tancred", "status": "high"},
+        {"person": "Franks", "status": "no_match", "person_group": True},
+    ]
+    (data / "doc.json").write_text(json.dumps({"doc_id": "doc", "links": links}))
+    queried = []
+    monkeypatch.setattr(W, "WD_API_DELAY", 0.0)
+    monkeypatch.setattr(
+        W, "reconcile_person", lambda name, limit: queried.append(name) or [{"qid": "Q1"}]
+    )
+
+    W.run(tmp_path, limit=3)
+
+    assert queried == ["Baldwin of Boulogne"]
+    out = json.loads((data / "wikidata_matches.json").read_text())
+    assert out["doc"]["baldwin of boulogne"]["candidates"] == [{"qid": "Q1"}]
+
+
+def test_run_reuses_answers_stored_under_other_documents(monkeypatch, tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    (data / "wikidata_matches.json").write_text(json.dumps({
+        "old": {"tancred": {"person": "Tancred", "candidates": [{"qid": "Q2"}],
+                            "queried_at": "2026-01-01T00:00:00"}},
+    }))
+    links = [{"person": "TANCRED", "status": "no_match"}]
+    (data / "new.json").write_text(json.dumps({"doc_id": "new", "links": links}))
+    monkeypatch.setattr(
+        W, "reconcile_person", lambda name, limit: pytest.fail(f"re-queried {name}")
+    )
+
+    W.run(tmp_path, limit=3)
+
+    out = json.loads((data / "wikidata_matches.json").read_text())
+    assert out["new"]["tancred"]["person"] == "TANCRED"
+    assert out["new"]["tancred"]["candidates"] == [{"qid": "Q2"}]
+    assert out["new"]["tancred"]["queried_at"] == "2026-01-01T00:00:00"
+
+
+def test_run_queries_a_name_shared_by_documents_once(monkeypatch, tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    for doc_id, person in (("a", "Raymond of Toulouse"), ("b", "Raymond of  Toulouse")):
+        links = [{"person": person, "status": "no_match"}]
+        (data / f"{doc_id}.json").write_text(json.dumps({"doc_id": doc_id, "links": links}))
+    queried = []
+    monkeypatch.setattr(W, "WD_API_DELAY", 0.0)
+    monkeypatch.setattr(
+        W, "reconcile_person", lambda name, limit: queried.append(name) or [{"qid": "Q3"}]
+    )
+
+    W.run(tmp_path, limit=3)
+
+    assert queried == ["Raymond of Toulouse"]
+    out = json.loads((data / "wikidata_matches.json").read_text())
+    assert out["a"]["raymond of toulouse"]["candidates"] == [{"qid": "Q3"}]
+    assert out["b"]["raymond of toulouse"]["person"] == "Raymond of  Toulouse"
+    assert out["b"]["raymond of toulouse"]["candidates"] == [{"qid": "Q3"}]
+
+
+def test_failed_lookups_are_not_stored_or_reused(monkeypatch, tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    for doc_id in ("a", "b"):
+        links = [{"person": "Bohemond", "status": "no_match"}]
+        (data / f"{doc_id}.json").write_text(json.dumps({"doc_id": doc_id, "links": links}))
+
+    def offline(name, limit):
+        raise OSError("Name or service not known")
+
+    monkeypatch.setattr(W, "WD_API_DELAY", 0.0)
+    monkeypatch.setattr(W, "wd_search_humans", offline)
+    assert W.reconcile_person("Bohemond") is None
+
+    W.run(tmp_path, limit=3)
+    out = json.loads((data / "wikidata_matches.json").read_text())
+    assert out == {"a": {}, "b": {}}
+
+    queried = []
+    monkeypatch.setattr(
+        W, "reconcile_person", lambda name, limit: queried.append(name) or [{"qid": "Q4"}]
+    )
+    W.run(tmp_path, limit=3)
+    assert queried == ["Bohemond"]
+    out = json.loads((data / "wikidata_matches.json").read_text())
+    assert out["b"]["bohemond"]["candidates"] == [{"qid": "Q4"}]